@@ -50,6 +50,8 @@ export interface MemoryRequest {
   config: LinearAllocationConfig | SegmentationConfig | PagingConfig | MultiLevelPagingConfig
   algorithm_type: 'linear' | 'segmentation' | 'paging' | 'multi_level_paging'
   simulation_time?: number
+  emit_timeline?: boolean
+  include_descriptions?: boolean
 }
 
 export interface AllocationEvent {
@@ -39,7 +39,7 @@ async def get_trap_table():
         return {
             "success": True,
             "data": {
-                "trap_table": [entry.dict() for entry in process_manager.get_trap_table()],
+                "trap_table": process_manager.get_trap_table_dicts(),
                 "system_calls": [call.dict() for call in process_manager.get_recent_system_calls(10)]
             }
         }
@@ -110,6 +110,8 @@ class MemoryRequest(BaseModel):
     config: Union[LinearAllocationConfig, SegmentationConfig, PagingConfig, MultiLevelPagingConfig]
     algorithm_type: Literal["linear", "segmentation", "paging", "multi_level_paging"]
     simulation_time: float = 100.0
+    emit_timeline: bool = True
+    include_descriptions: bool = True
 
 class AllocationEvent(BaseModel):
     time: float
@@ -1,697 +1,145 @@
 from typing import List, Dict, Optional, Any, Tuple
-import math
-import time
-from collections import deque, defaultdict
+from bisect import bisect_left, insort
+from collections import deque
+from operator import attrgetter
 from app.models.memory import (
-    Process, MemoryBlock, Segment, Page, Frame, PageTableEntry,
-    MemoryRequest, AllocationEvent, MemoryState, MemoryMetrics,
-    MemoryVisualization, MemoryResult, LinearAllocationConfig,
-    SegmentationConfig, PagingConfig, MultiLevelPagingConfig,
-    MemoryAllocationMethod, ReplacementAlgorithm
+    Process, Segment, MemoryRequest, AllocationEvent, MemoryState,
+    MemoryMetrics, MemoryVisualization, MemoryResult, MemoryAllocationMethod
 )
 
-class MemoryManagementService:
-    def __init__(self):
-        self.current_time = 0.0
-        self.events = []
-        self.memory_states = []
-        
-    def linear_allocation(self, request: MemoryRequest) -> MemoryResult:
-        """Linear/Contiguous Memory Allocation with different fit algorithms"""
-        config = request.config
-        processes = request.processes
-        
-        total_memory = config.total_memory * 1024
-        os_memory = config.os_reserved * 1024
-        available_memory = total_memory - os_memory
-        
-        memory_blocks = [
-            MemoryBlock(id=0, start_address=0, size=os_memory, is_allocated=True, 
-                       process_id=-1, process_name="OS"),
-            MemoryBlock(id=1, start_address=os_memory, size=available_memory, is_allocated=False)
-        ]
-        
-        allocated_processes = []
-        events = []
-        states = []
-        failed_allocations = 0
-        successful_allocations = 0
-        
-        sorted_processes = sorted(processes, key=lambda x: x.arrival_time)
-        
-        for process in sorted_processes:
-            self.current_time = process.arrival_time
-            process_size = process.size * 1024
-            
-            allocated_block = self._find_suitable_block(
-                memory_blocks, process_size, config.allocation_method
-            )
-            
-            if allocated_block:
-                if allocated_block.size > process_size:
-                    new_block = MemoryBlock(
-                        id=len(memory_blocks),
-                        start_address=allocated_block.start_address + process_size,
-                        size=allocated_block.size - process_size,
-                        is_allocated=False
-                    )
-                    memory_blocks.append(new_block)
-                    allocated_block.size = process_size
-                
-                allocated_block.is_allocated = True
-                allocated_block.process_id = process.id
-                allocated_block.process_name = process.name
-                
-                events.append(AllocationEvent(
-                    time=self.current_time,
-                    event_type="allocate",
-                    process_id=process.id,
-                    process_name=process.name,
-                    size=process_size,
-                    address=allocated_block.start_address,
-                    description=f"Process {process.name} allocated {process_size} bytes at address {allocated_block.start_address}"
-                ))
-                
-                allocated_processes.append({
-                    "id": process.id,
-                    "name": process.name,
-                    "size": process_size,
-                    "start_address": allocated_block.start_address,
-                    "end_address": allocated_block.start_address + process_size - 1,
-                    "allocation_method": config.allocation_method.value
-                })
-                
-                successful_allocations += 1
-            else:
-                if config.enable_compaction:
-                    memory_blocks = self._compact_memory(memory_blocks)
-                    allocated_block = self._find_suitable_block(
-                        memory_blocks, process_size, config.allocation_method
-                    )
-                    
-                    if allocated_block:
-                        if allocated_block.size > process_size:
-                            new_block = MemoryBlock(
-                                id=len(memory_blocks),
-                                start_address=allocated_block.start_address + process_size,
-                                size=allocated_block.size - process_size,
-                                is_allocated=False
-                            )
-                            memory_blocks.append(new_block)
-                            allocated_block.size = process_size
-                        
-                        allocated_block.is_allocated = True
-                        allocated_block.process_id = process.id
-                        allocated_block.process_name = process.name
-                        
-                        events.append(AllocationEvent(
-                            time=self.current_time,
-                            event_type="compaction",
-                            process_id=-1,
-                            process_name="System",
-                            description="Memory compaction performed"
-                        ))
-                        
-                        events.append(AllocationEvent(
-                            time=self.current_time,
-                            event_type="allocate",
-                            process_id=process.id,
-                            process_name=process.name,
-                            size=process_size,
-                            address=allocated_block.start_address,
-                            description=f"Process {process.name} allocated {process_size} bytes at address {allocated_block.start_address} after compaction"
-                        ))
-                        
-                        successful_allocations += 1
-                    else:
-                        failed_allocations += 1
-                        events.append(AllocationEvent(
-                            time=self.current_time,
-                            event_type="allocation_failed",
-                            process_id=process.id,
-                            process_name=process.name,
-                            size=process_size,
-                            description=f"Process {process.name} allocation failed - insufficient memory"
-                        ))
-                else:
-                    failed_allocations += 1
-                    events.append(AllocationEvent(
-                        time=self.current_time,
-                        event_type="allocation_failed",
-                        process_id=process.id,
-                        process_name=process.name,
-                        size=process_size,
-                        description=f"Process {process.name} allocation failed - insufficient memory"
-                    ))
-            
-            states.append(self._create_memory_state(memory_blocks, self.current_time))
-        
-        metrics = self._calculate_linear_metrics(
-            memory_blocks, total_memory, successful_allocations, failed_allocations
-        )
-        
-        visualization = self._create_linear_visualization(memory_blocks, events)
-        
-        return MemoryResult(
-            success=True,
-            algorithm=f"Linear Allocation ({config.allocation_method.value})",
-            processes=allocated_processes,
-            metrics=metrics,
-            visualization=visualization,
-            memory_states=states,
-            final_state={"memory_blocks": [block.dict() for block in memory_blocks]},
-            statistics={
-                "successful_allocations": successful_allocations,
-                "failed_allocations": failed_allocations,
-                "compaction_enabled": config.enable_compaction
-            }
-        )
-    
-    def segmentation(self, request: MemoryRequest) -> MemoryResult:
-        """Simulate segmentation algorithm"""
-        try:
-            config = request.config
-            total_memory = config.total_memory
-            max_segments = config.max_segments_per_process
-            
-            segments = []
-            events = []
-            states = []
-            explanation = []
-            successful_allocations = 0
-            failed_allocations = 0
-            
-            explanation.append(f"Starting segmentation simulation")
-            explanation.append(f"Total memory: {total_memory} KB, Max segments per process: {max_segments}")
-            
-            current_address = 0
-            
-            # Process each process
-            for process in sorted(request.processes, key=lambda p: p.arrival_time):
-                # Create segments for process (code, data, stack)
-                segment_types = ['code', 'data', 'stack']
-                process_segments = []
-                allocated = True
-                
-                for i, seg_type in enumerate(segment_types[:max_segments]):
-                    seg_size = process.size // len(segment_types)
-                    if i == len(segment_types) - 1:  # Last segment gets remainder
-                        seg_size = process.size - (seg_size * (len(segment_types) - 1))
-                    
-                    if current_address + seg_size <= total_memory:
-                        segment = Segment(
-                            segment_id=len(segments),
-                            process_id=process.id,
-                            segment_type=seg_type,
-                            base_address=current_address,
-                            limit=current_address + seg_size,
-                            size=seg_size,
-                            protection={'read': True, 'write': seg_type != 'code', 'execute': seg_type == 'code'}
-                        )
-                        segments.append(segment)
-                        process_segments.append(segment)
-                        current_address += seg_size
-                        successful_allocations += 1
-                    else:
-                        allocated = False
-                        failed_allocations += 1
-                        break
-                
-                # Create allocation event
-                event = AllocationEvent(
-                    time=process.arrival_time,
-                    event_type="allocate" if allocated else "allocation_failed",
-                    process_id=process.id,
-                    process_name=process.name,
-                    size=process.size,
-                    address=process_segments[0].base_address if process_segments else 0,
-                    success=allocated,
-                    description=f"{'Allocated' if allocated else 'Failed to allocate'} {len(process_segments)} segments for {process.name}"
-                )
-                events.append(event)
-                
-                if allocated:
-                    explanation.append(f"✓ Allocated {len(process_segments)} segments for {process.name}")
-                else:
-                    explanation.append(f"✗ Failed to allocate segments for {process.name}")
-            
-            # Calculate metrics
-            allocated_memory = sum(seg.size for seg in segments)
-            free_memory = total_memory - allocated_memory
-            memory_utilization = (allocated_memory / total_memory) * 100
-            
-            metrics = MemoryMetrics(
-                total_memory=total_memory,
-                allocated_memory=allocated_memory,
-                free_memory=free_memory,
-                memory_utilization=memory_utilization,
-                external_fragmentation=10.0,  # Segmentation can have external fragmentation
-                internal_fragmentation=2.0,   # But minimal internal fragmentation
-                average_allocation_time=1.8,
-                failed_allocations=failed_allocations,
-                successful_allocations=successful_allocations,
-                page_faults=0,
-                page_hits=0,
-                swap_ins=0,
-                swap_outs=0,
-                hit_ratio=0.0
-            )
-            
-            visualization = self._create_segmentation_visualization(segments, events)
-            
-            return self._create_result("segmentation", metrics, visualization, states, explanation)
-            
-        except Exception as e:
-            raise Exception(f"Segmentation simulation failed: {str(e)}")
+_GET_SIZE = attrgetter('size')
+_GET_ARRIVAL = attrgetter('arrival_time')
+_SEGMENT_FIELDS = attrgetter('id', 'base_address', 'limit', 'size', 'process_id', 'segment_type')
 
-    def paging(self, request: MemoryRequest) -> MemoryResult:
-        """Paging Memory Management with Virtual Memory"""
-        config = request.config
-        processes = request.processes
-        
-        total_memory = config.total_memory * 1024
-        page_size = config.page_size * 1024
-        total_frames = total_memory // page_size
-        
-        frames = [Frame(frame_number=i, size=page_size) for i in range(total_frames)]
-        page_tables = {}
-        allocated_processes = []
-        events = []
-        states = []
-        
-        page_faults = 0
-        page_hits = 0
-        
-        for process in sorted(processes, key=lambda x: x.arrival_time):
-            self.current_time = process.arrival_time
-            process_size = process.size * 1024
-            pages_needed = math.ceil(process_size / page_size)
-            
-            page_table = []
-            allocated_frames = []
-            
-            for page_num in range(pages_needed):
-                free_frame = None
-                for frame in frames:
-                    if not frame.is_allocated:
-                        free_frame = frame
-                        break
-                
-                if free_frame:
-                    free_frame.is_allocated = True
-                    free_frame.page_number = page_num
-                    free_frame.process_id = process.id
-                    allocated_frames.append(free_frame.frame_number)
-                    
-                    page_entry = PageTableEntry(
-                        page_number=page_num,
-                        frame_number=free_frame.frame_number,
-                        present=True
-                    )
-                    page_table.append(page_entry)
-                    page_hits += 1
-                else:
-                    if config.enable_virtual_memory:
-                        replaced_frame = self._page_replacement(
-                            frames, config.replacement_algorithm, process.id
-                        )
-                        if replaced_frame:
-                            page_entry = PageTableEntry(
-                                page_number=page_num,
-                                frame_number=replaced_frame.frame_number,
-                                present=True
-                            )
-                            page_table.append(page_entry)
-                            page_faults += 1
-                            
-                            events.append(AllocationEvent(
-                                time=self.current_time,
-                                event_type="page_fault",
-                                process_id=process.id,
-                                process_name=process.name,
-                                page_number=page_num,
-                                frame_number=replaced_frame.frame_number,
-                                description=f"Page fault: Page {page_num} loaded into frame {replaced_frame.frame_number}"
-                            ))
-                    else:
-                        page_entry = PageTableEntry(
-                            page_number=page_num,
-                            present=False
-                        )
-                        page_table.append(page_entry)
-                        page_faults += 1
-            
-            page_tables[process.id] = page_table
-            
-            events.append(AllocationEvent(
-                time=self.current_time,
-                event_type="allocate",
-                process_id=process.id,
-                process_name=process.name,
-                size=process_size,
-                description=f"Process {process.name} allocated {pages_needed} pages"
-            ))
-            
-            allocated_processes.append({
-                "id": process.id,
-                "name": process.name,
-                "size": process_size,
-                "pages_needed": pages_needed,
-                "allocated_frames": allocated_frames,
-                "page_table": [entry.dict() for entry in page_table]
-            })
-            
-            states.append(self._create_paging_state(frames, page_tables, self.current_time))
-        
-        metrics = self._calculate_paging_metrics(
-            frames, total_memory, page_faults, page_hits
-        )
-        
-        visualization = self._create_paging_visualization(frames, page_tables, events)
-        
-        return MemoryResult(
-            success=True,
-            algorithm="Paging",
-            processes=allocated_processes,
-            metrics=metrics,
-            visualization=visualization,
-            memory_states=states,
-            final_state={
-                "frames": [frame.dict() for frame in frames],
-                "page_tables": {pid: [entry.dict() for entry in table] 
-                              for pid, table in page_tables.items()}
-            },
-            statistics={
-                "page_faults": page_faults,
-                "page_hits": page_hits,
-                "hit_ratio": page_hits / (page_hits + page_faults) if (page_hits + page_faults) > 0 else 0,
-                "total_frames": total_frames,
-                "page_size": page_size
-            }
-        )
-    
-    def multi_level_paging(self, request: MemoryRequest) -> MemoryResult:
-        """Simulate multi-level paging algorithm"""
-        try:
-            config = request.config
-            total_memory = config.total_memory
-            page_size = config.page_size
-            levels = config.levels
-            total_frames = total_memory // page_size
-            
-            # Initialize frames
-            frames = []
-            for i in range(total_frames):
-                frames.append(Frame(
-                    frame_number=i,
-                    size=page_size,
-                    is_allocated=False,
-                    process_id=None,
-                    page_number=None
-                ))
-            
-            multi_level_page_tables = {}
-            events = []
-            states = []
-            explanation = []
-            page_faults = 0
-            page_hits = 0
-            successful_allocations = 0
-            
-            explanation.append(f"Starting multi-level paging simulation with {levels} levels")
-            explanation.append(f"Total frames: {total_frames}, Page size: {page_size}KB")
-            
-            # Process each process
-            for process in sorted(request.processes, key=lambda p: p.arrival_time):
-                pages_needed = (process.size + page_size - 1) // page_size
-                allocated_pages = 0
-                
-                # Create multi-level page table structure
-                page_table = self._create_multilevel_page_table(pages_needed, levels, process.id)
-                
-                explanation.append(f"Creating {levels}-level page table for {process.name}")
-                
-                # Allocate frames
-                for page_num in range(pages_needed):
-                    frame_found = False
-                    for frame in frames:
-                        if not frame.is_allocated:
-                            frame.is_allocated = True
-                            frame.process_id = process.id
-                            frame.page_number = page_num
-                            allocated_pages += 1
-                            page_hits += 1
-                            frame_found = True
-                            break
-                    
-                    if not frame_found:
-                        page_faults += 1
-                
-                if allocated_pages > 0:
-                    multi_level_page_tables[process.id] = page_table
-                    successful_allocations += allocated_pages
-                    
-                    event = AllocationEvent(
-                        time=process.arrival_time,
-                        event_type="allocate",
-                        process_id=process.id,
-                        process_name=process.name,
-                        size=process.size,
-                        address=0,
-                        success=True,
-                        description=f"Allocated {allocated_pages} pages with {levels}-level paging for {process.name}"
-                    )
-                    events.append(event)
-                    
-                    explanation.append(f"✓ Allocated {allocated_pages} pages for {process.name}")
-            
-            # Calculate metrics
-            metrics = self._calculate_paging_metrics(frames, total_memory, page_faults, page_hits)
-            visualization = self._create_multilevel_paging_visualization(frames, multi_level_page_tables, events, levels)
-            
-            explanation.append(f"Multi-level paging completed with {levels} levels")
-            
-            return self._create_result("multi_level_paging", metrics, visualization, states, explanation)
-            
-        except Exception as e:
-            raise Exception(f"Multi-level paging simulation failed: {str(e)}")
-    
-    def _find_suitable_block(self, blocks: List[MemoryBlock], size: int, method: MemoryAllocationMethod) -> Optional[MemoryBlock]:
-        """Find suitable memory block using specified allocation method"""
-        free_blocks = [block for block in blocks if not block.is_allocated and block.size >= size]
-        
-        if not free_blocks:
-            return None
-        
-        if method == MemoryAllocationMethod.FIRST_FIT:
-            return free_blocks[0]
-        elif method == MemoryAllocationMethod.BEST_FIT:
-            return min(free_blocks, key=lambda x: x.size)
-        elif method == MemoryAllocationMethod.WORST_FIT:
-            return max(free_blocks, key=lambda x: x.size)
-        elif method == MemoryAllocationMethod.NEXT_FIT:
-            return free_blocks[0]
-        
-        return None
+# Segments carved out of each process, and the protection bits for each kind
+_SEGMENT_TYPES = ('code', 'data', 'stack')
+_SEGMENT_PROTECTION = {
+    seg_type: {'read': True, 'write': seg_type != 'code', 'execute': seg_type == 'code'}
+    for seg_type in _SEGMENT_TYPES
+}
+
+# Structure keys for the usual page table depths, built once
+_LEVEL_KEYS = tuple(f"level_{level}" for level in range(16))
+
+# Only pays off for models carrying large layout or timeline lists; flat models such as
+# MemoryMetrics and AllocationEvent validate faster than they construct under pydantic v2
+def _construct(model, **fields):
+    """Build a model from internally computed values without re-running validation"""
+    build = getattr(model, 'model_construct', None) or model.construct
+    return build(**fields)
+
+class _BlockRecord:
+    """Mutable memory block used inside the simulation loops, mirrors MemoryBlock without validation"""
+    __slots__ = ('id', 'start_address', 'size', 'is_allocated', 'process_id', 'process_name')
     
-    def _compact_memory(self, blocks: List[MemoryBlock]) -> List[MemoryBlock]:
-        """Compact memory by moving all allocated blocks to the beginning"""
-        allocated_blocks = [block for block in blocks if block.is_allocated]
-        
-        current_address = 0
-        for block in allocated_blocks:
-            block.start_address = current_address
-            current_address += block.size
-        
-        total_memory = sum(block.size for block in blocks)
-        remaining_size = total_memory - current_address
-        
-        if remaining_size > 0:
-            free_block = MemoryBlock(
-                id=max(block.id for block in blocks) + 1,
-                start_address=current_address,
-                size=remaining_size,
-                is_allocated=False
-            )
-            allocated_blocks.append(free_block)
-        
-        return allocated_blocks
+    def __init__(self, id: int, start_address: int, size: int, is_allocated: bool = False,
+                 process_id: Optional[int] = None, process_name: Optional[str] = None):
+        self.id = id
+        self.start_address = start_address
+        self.size = size
+        self.is_allocated = is_allocated
+        self.process_id = process_id
+        self.process_name = process_name
+
+class _FrameRecord:
+    """Mutable page frame used inside the simulation loops, mirrors Frame without validation"""
+    __slots__ = ('frame_number', 'size', 'is_allocated', 'page_number', 'process_id')
     
-    def _page_replacement(self, frames: List[Frame], algorithm: ReplacementAlgorithm, process_id: int) -> Optional[Frame]:
-        """Implement page replacement algorithms"""
-        allocated_frames = [frame for frame in frames if frame.is_allocated]
-        
-        if not allocated_frames:
-            return None
-        
-        if algorithm == ReplacementAlgorithm.FIFO:
-            victim_frame = allocated_frames[0]
-        elif algorithm == ReplacementAlgorithm.LRU:
-            victim_frame = allocated_frames[0]
+    def __init__(self, frame_number: int, size: int, is_allocated: bool = False,
+                 page_number: Optional[int] = None, process_id: Optional[int] = None):
+        self.frame_number = frame_number
+        self.size = size
+        self.is_allocated = is_allocated
+        self.page_number = page_number
+        self.process_id = process_id
+
+def _block_layout_row(block: _BlockRecord) -> Dict[str, Any]:
+    """Memory layout row for a block in linear allocation state snapshots"""
+    return {
+        "start": block.start_address,
+        "size": block.size,
+        "allocated": block.is_allocated,
+        "process_id": block.process_id,
+        "process_name": block.process_name
+    }
+
+def _address_index(free_blocks: List[_BlockRecord], address: int) -> int:
+    """Position of the block starting at address in the address-ordered free list"""
+    lo, hi = 0, len(free_blocks)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if free_blocks[mid].start_address < address:
+            lo = mid + 1
         else:
-            victim_frame = allocated_frames[0]
-        
-        victim_frame.is_allocated = False
-        victim_frame.page_number = None
-        victim_frame.process_id = None
-        
-        victim_frame.is_allocated = True
-        victim_frame.process_id = process_id
-        
-        return victim_frame
-    
-    def _create_memory_state(self, blocks: List[MemoryBlock], time: float) -> MemoryState:
-        """Create memory state snapshot"""
-        allocated_memory = sum(block.size for block in blocks if block.is_allocated)
-        total_memory = sum(block.size for block in blocks)
-        free_memory = total_memory - allocated_memory
-        
-        free_blocks = [block for block in blocks if not block.is_allocated]
-        external_frag = len(free_blocks) - 1 if len(free_blocks) > 1 else 0
-        
-        return MemoryState(
-            time=time,
-            memory_blocks=blocks.copy(),
-            allocated_memory=allocated_memory,
-            free_memory=free_memory,
-            fragmentation={"external": external_frag, "internal": 0},
-            processes=[
-                {"id": block.process_id, "name": block.process_name, "size": block.size}
-                for block in blocks if block.is_allocated and block.process_id != -1
-            ]
-        )
-    
-    def _calculate_linear_metrics(self, blocks: List[MemoryBlock], total_memory: int, 
-                                failed_allocations: int, successful_allocations: int, 
-                                total_time: float) -> MemoryMetrics:
-        """Calculate metrics for linear allocation"""
-        allocated_memory = sum(block.size for block in blocks if block.is_allocated)
-        free_memory = total_memory - allocated_memory
-        memory_utilization = (allocated_memory / total_memory) * 100
-        
-        # Calculate external fragmentation
-        free_blocks = [block for block in blocks if not block.is_allocated]
-        total_free = sum(block.size for block in free_blocks)
-        largest_free = max((block.size for block in free_blocks), default=0)
-        external_fragmentation = ((total_free - largest_free) / total_free * 100) if total_free > 0 else 0
-        
-        # Internal fragmentation is minimal for linear allocation
-        internal_fragmentation = 5.0  # Approximate value
-        
-        average_allocation_time = total_time / max(successful_allocations, 1)
-        
-        return MemoryMetrics(
-            total_memory=total_memory,
-            allocated_memory=allocated_memory,
-            free_memory=free_memory,
-            memory_utilization=memory_utilization,
-            external_fragmentation=external_fragmentation,
-            internal_fragmentation=internal_fragmentation,
-            average_allocation_time=average_allocation_time,
-            failed_allocations=failed_allocations,
-            successful_allocations=successful_allocations,
-            page_faults=0,
-            page_hits=0,
-            swap_ins=0,
-            swap_outs=0,
-            hit_ratio=0.0
-        )
+            hi = mid
+    return lo
 
-    def _create_linear_visualization(self, blocks: List[MemoryBlock], events: List[AllocationEvent]) -> MemoryVisualization:
-        """Create visualization data for linear allocation"""
-        memory_map = []
-        for block in blocks:
-            memory_map.append({
-                "start": block.start_address,
-                "end": block.start_address + block.size - 1,
-                "size": block.size,
-                "allocated": block.is_allocated,
-                "process_id": block.process_id,
-                "process_name": block.process_name,
-                "type": "allocated" if block.is_allocated else "free"
-            })
-        
-        fragmentation_chart = []
-        free_blocks = [block for block in blocks if not block.is_allocated]
-        for i, block in enumerate(free_blocks):
-            fragmentation_chart.append({
-                "block_id": i,
-                "size": block.size,
-                "start": block.start_address
-            })
-        
-        return MemoryVisualization(
-            memory_map=memory_map,
-            timeline=events,
-            fragmentation_chart=fragmentation_chart
-        )
+# Fit strategies take the address-ordered free list plus a sorted (size, start_address)
+# index of the same blocks, and return an index into free_blocks or -1
 
-    def _calculate_paging_metrics(self, frames: List[Frame], total_memory: int, 
-                                 page_faults: int, page_hits: int) -> MemoryMetrics:
-        """Calculate metrics for paging"""
-        allocated_frames = sum(1 for frame in frames if frame.is_allocated)
-        allocated_memory = allocated_frames * (frames[0].size if frames else 4)
-        free_memory = total_memory - allocated_memory
-        memory_utilization = (allocated_memory / total_memory) * 100
-        
-        # Paging has minimal external fragmentation
-        external_fragmentation = 2.0
-        # But can have internal fragmentation
-        internal_fragmentation = 15.0
-        
-        hit_ratio = (page_hits / max(page_hits + page_faults, 1)) * 100
-        
-        return MemoryMetrics(
-            total_memory=total_memory,
-            allocated_memory=allocated_memory,
-            free_memory=free_memory,
-            memory_utilization=memory_utilization,
-            external_fragmentation=external_fragmentation,
-            internal_fragmentation=internal_fragmentation,
-            average_allocation_time=2.5,
-            failed_allocations=0,
-            successful_allocations=allocated_frames,
-            page_faults=page_faults,
-            page_hits=page_hits,
-            swap_ins=page_faults // 2,
-            swap_outs=page_faults // 3,
-            hit_ratio=hit_ratio
-        )
+def _first_fit(free_blocks: List[_BlockRecord], free_sizes: List[Tuple[int, int]], size: int) -> int:
+    """Index of the lowest-addressed free block that fits, or -1"""
+    if not free_sizes or free_sizes[-1][0] < size:
+        return -1
+    for i, block in enumerate(free_blocks):
+        if block.size >= size:
+            return i
+    return -1
 
-    def _create_paging_visualization(self, frames: List[Frame], page_tables: Dict, 
-                                   events: List[AllocationEvent]) -> MemoryVisualization:
-        """Create visualization for paging"""
-        memory_map = []
-        for frame in frames:
-            memory_map.append({
-                "frame_number": frame.frame_number,
-                "start": frame.frame_number * frame.size,
-                "end": (frame.frame_number + 1) * frame.size - 1,
-                "size": frame.size,
-                "allocated": frame.is_allocated,
-                "process_id": frame.process_id,
-                "page_number": frame.page_number,
-                "type": "allocated" if frame.is_allocated else "free"
-            })
-        
-        page_table_list = []
-        for process_id, table in page_tables.items():
-            for entry in table:
-                page_table_list.append({
-                    "process_id": process_id,
-                    "page_number": entry.page_number,
-                    "frame_number": entry.frame_number,
-                    "present": entry.present
-                })
-        
-        return MemoryVisualization(
-            memory_map=memory_map,
-            page_table=page_table_list,
-            timeline=events,
-            fragmentation_chart=[]
-        )
+def _best_fit(free_blocks: List[_BlockRecord], free_sizes: List[Tuple[int, int]], size: int) -> int:
+    """Index of the smallest free block that fits, lowest address first, or -1"""
+    pos = bisect_left(free_sizes, (size, -1))
+    if pos == len(free_sizes):
+        return -1
+    return _address_index(free_blocks, free_sizes[pos][1])
 
-    # Add comprehensive result creation methods
+def _worst_fit(free_blocks: List[_BlockRecord], free_sizes: List[Tuple[int, int]], size: int) -> int:
+    """Index of the largest free block that fits, lowest address first, or -1"""
+    if not free_sizes or free_sizes[-1][0] < size:
+        return -1
+    pos = bisect_left(free_sizes, (free_sizes[-1][0], -1))
+    return _address_index(free_blocks, free_sizes[pos][1])
+
+# Next fit keeps a roving cursor per run, see _LinearRun.next_fit
+_FIT_STRATEGIES = {
+    MemoryAllocationMethod.FIRST_FIT: _first_fit,
+    MemoryAllocationMethod.BEST_FIT: _best_fit,
+    MemoryAllocationMethod.WORST_FIT: _worst_fit,
+}
+
+class _LinearRun:
+    """Bookkeeping for one linear allocation simulation, kept off the shared service"""
+    __slots__ = ('free_sizes', 'block_layout', 'next_fit_address', 'next_block_id')
+    
+    def __init__(self, blocks: List[_BlockRecord], free_blocks: List[_BlockRecord]):
+        self.free_sizes = sorted((b.size, b.start_address) for b in free_blocks)
+        # Layout rows in step with blocks; snapshots share rows and only changed blocks get a new one
+        self.block_layout = list(map(_block_layout_row, blocks))
+        self.next_fit_address = 0
+        self.next_block_id = len(blocks)
+    
+    def next_fit(self, free_blocks: List[_BlockRecord], free_sizes: List[Tuple[int, int]], size: int) -> int:
+        """Index of the first free block that fits at or after the roving cursor, wrapping, or -1"""
+        if not free_sizes or free_sizes[-1][0] < size:
+            return -1
+        
+        count = len(free_blocks)
+        start = _address_index(free_blocks, self.next_fit_address)
+        for offset in range(count):
+            i = (start + offset) % count
+            block = free_blocks[i]
+            if block.size >= size:
+                # Resume the next search just past this allocation
+                self.next_fit_address = block.start_address + size
+                return i
+        return -1
+
+class MemoryManagementService:
+    def __init__(self):
+        self.current_time = 0.0
+        self.events = []
+        self.memory_states = []
+        
     def _create_result(self, algorithm: str, metrics: MemoryMetrics, 
                       visualization: MemoryVisualization, states: List[MemoryState],
                       explanation: List[str]) -> MemoryResult:
@@ -714,7 +162,8 @@ class MemoryManagementService:
             method = config.allocation_method
             
             # Initialize memory with OS reserved space
-            blocks = [MemoryBlock(
+            blocks = [_BlockRecord(
+                id=0,
                 start_address=0,
                 size=config.os_reserved,
                 is_allocated=True,
@@ -723,7 +172,8 @@ class MemoryManagementService:
             )]
             
             if total_memory > config.os_reserved:
-                blocks.append(MemoryBlock(
+                blocks.append(_BlockRecord(
+                    id=1,
                     start_address=config.os_reserved,
                     size=total_memory - config.os_reserved,
                     is_allocated=False,
@@ -732,6 +182,8 @@ class MemoryManagementService:
                 ))
             
             events = []
+            emit_timeline = request.emit_timeline
+            include_descriptions = request.include_descriptions
             states = []
             explanation = []
             successful_allocations = 0
@@ -740,129 +192,62 @@ class MemoryManagementService:
             explanation.append(f"Starting linear allocation simulation with {method} method")
             explanation.append(f"Total memory: {total_memory} KB, OS reserved: {config.os_reserved} KB")
             
+            # Free blocks in address order, kept in step with blocks
+            free_blocks = [block for block in blocks if not block.is_allocated]
+            run = _LinearRun(blocks, free_blocks)
+            find_block = self._fit_strategy(method, run)
+            
+            # Splits preserve the block total, and each placement takes exactly the process size
+            block_memory = sum(map(_GET_SIZE, blocks))
+            free_memory = sum(map(_GET_SIZE, free_blocks))
+            
             # Process each process
-            for process in sorted(request.processes, key=lambda p: p.arrival_time):
+            for process in sorted(request.processes, key=_GET_ARRIVAL):
                 event_time = process.arrival_time
                 allocated = False
+                free_idx = find_block(free_blocks, run.free_sizes, process.size)
                 
-                # Find suitable block based on allocation method
-                if method == "first_fit":
-                    for i, block in enumerate(blocks):
-                        if not block.is_allocated and block.size >= process.size:
-                            # Allocate memory
-                            if block.size > process.size:
-                                # Split block
-                                new_block = MemoryBlock(
-                                    start_address=block.start_address + process.size,
-                                    size=block.size - process.size,
-                                    is_allocated=False,
-                                    process_id=None,
-                                    process_name=None
-                                )
-                                blocks.insert(i + 1, new_block)
-                            
-                            block.size = process.size
-                            block.is_allocated = True
-                            block.process_id = process.id
-                            block.process_name = process.name
-                            allocated = True
-                            break
-                
-                elif method == "best_fit":
-                    best_block_idx = -1
-                    best_size = float('inf')
-                    
-                    for i, block in enumerate(blocks):
-                        if not block.is_allocated and block.size >= process.size and block.size < best_size:
-                            best_block_idx = i
-                            best_size = block.size
-                    
-                    if best_block_idx != -1:
-                        block = blocks[best_block_idx]
-                        if block.size > process.size:
-                            new_block = MemoryBlock(
-                                start_address=block.start_address + process.size,
-                                size=block.size - process.size,
-                                is_allocated=False,
-                                process_id=None,
-                                process_name=None
-                            )
-                            blocks.insert(best_block_idx + 1, new_block)
-                        
-                        block.size = process.size
-                        block.is_allocated = True
-                        block.process_id = process.id
-                        block.process_name = process.name
-                        allocated = True
-                
-                elif method == "worst_fit":
-                    worst_block_idx = -1
-                    worst_size = -1
-                    
-                    for i, block in enumerate(blocks):
-                        if not block.is_allocated and block.size >= process.size and block.size > worst_size:
-                            worst_block_idx = i
-                            worst_size = block.size
-                    
-                    if worst_block_idx != -1:
-                        block = blocks[worst_block_idx]
-                        if block.size > process.size:
-                            new_block = MemoryBlock(
-                                start_address=block.start_address + process.size,
-                                size=block.size - process.size,
-                                is_allocated=False,
-                                process_id=None,
-                                process_name=None
-                            )
-                            blocks.insert(worst_block_idx + 1, new_block)
-                        
-                        block.size = process.size
-                        block.is_allocated = True
-                        block.process_id = process.id
-                        block.process_name = process.name
-                        allocated = True
+                if free_idx != -1:
+                    block = self._place_process(run, blocks, free_blocks, free_idx, process)
+                    allocated = True
                 
                 # Create allocation event
-                event = AllocationEvent(
-                    time=event_time,
-                    event_type="allocate" if allocated else "allocation_failed",
-                    process_id=process.id,
-                    process_name=process.name,
-                    size=process.size,
-                    address=block.start_address if allocated else 0,
-                    success=allocated,
-                    description=f"{'Allocated' if allocated else 'Failed to allocate'} {process.size}KB for {process.name}"
-                )
-                events.append(event)
+                if emit_timeline:
+                    event = AllocationEvent(
+                        time=event_time,
+                        event_type="allocate" if allocated else "allocation_failed",
+                        process_id=process.id,
+                        process_name=process.name,
+                        size=process.size,
+                        address=block.start_address if allocated else 0,
+                        success=allocated,
+                        description=f"{'Allocated' if allocated else 'Failed to allocate'} {process.size}KB for {process.name}" if include_descriptions else ""
+                    )
+                    events.append(event)
                 
                 if allocated:
                     successful_allocations += 1
+                    free_memory -= process.size
                     explanation.append(f"✓ Allocated {process.size}KB for {process.name} at address {block.start_address}")
                 else:
                     failed_allocations += 1
                     explanation.append(f"✗ Failed to allocate {process.size}KB for {process.name} - insufficient contiguous memory")
                 
                 # Create memory state snapshot
-                state = MemoryState(
+                state = _construct(MemoryState,
                     time=event_time,
-                    memory_layout=[
-                        {
-                            "start": b.start_address,
-                            "size": b.size,
-                            "allocated": b.is_allocated,
-                            "process_id": b.process_id,
-                            "process_name": b.process_name
-                        } for b in blocks
-                    ],
-                    free_memory=sum(b.size for b in blocks if not b.is_allocated),
-                    allocated_memory=sum(b.size for b in blocks if b.is_allocated)
+                    memory_layout=run.block_layout.copy(),
+                    free_memory=free_memory,
+                    allocated_memory=block_memory - free_memory
                 )
                 states.append(state)
             
             # Calculate metrics and create visualization
-            metrics = self._calculate_linear_metrics(blocks, total_memory, failed_allocations, 
+            largest_free = run.free_sizes[-1][0] if run.free_sizes else 0
+            metrics = self._calculate_linear_metrics(block_memory - free_memory, free_memory, largest_free,
+                                                   total_memory, failed_allocations, 
                                                    successful_allocations, request.simulation_time)
-            visualization = self._create_linear_visualization(blocks, events)
+            visualization = self._create_linear_visualization(blocks, free_blocks, events)
             
             explanation.append(f"Simulation completed with {successful_allocations} successful and {failed_allocations} failed allocations")
             
@@ -880,25 +265,32 @@ class MemoryManagementService:
             total_frames = total_memory // page_size
             
             # Initialize frames
-            frames = []
-            for i in range(total_frames):
-                frames.append(Frame(
-                    frame_number=i,
-                    size=page_size,
-                    is_allocated=False,
-                    process_id=None,
-                    page_number=None
-                ))
+            frames = self._create_frames(total_frames, page_size)
             
             # Reserve frames for OS
-            os_frames_needed = max(1, config.get('os_reserved', 64) // page_size)
+            os_frames_needed = max(1, getattr(config, 'os_reserved', 64) // page_size)
             for i in range(min(os_frames_needed, total_frames)):
                 frames[i].is_allocated = True
                 frames[i].process_id = -1
                 frames[i].page_number = i
             
+            # Free list of frame numbers so each page allocation is O(1)
+            free_frames = deque(range(os_frames_needed, total_frames))
+            
+            # Per-frame layout rows; snapshots share rows and only changed frames get a new one
+            frame_layout = [
+                {
+                    "frame_number": f.frame_number,
+                    "allocated": f.is_allocated,
+                    "process_id": f.process_id,
+                    "page_number": f.page_number
+                } for f in frames
+            ]
+            
             page_tables = {}
             events = []
+            emit_timeline = request.emit_timeline
+            include_descriptions = request.include_descriptions
             states = []
             explanation = []
             page_faults = 0
@@ -909,95 +301,87 @@ class MemoryManagementService:
             explanation.append(f"Total frames: {total_frames}, OS reserved: {os_frames_needed} frames")
             
             # Process each process
-            for process in sorted(request.processes, key=lambda p: p.arrival_time):
+            for process in sorted(request.processes, key=_GET_ARRIVAL):
                 pages_needed = (process.size + page_size - 1) // page_size  # Ceiling division
-                allocated_pages = 0
-                page_table = []
                 
                 explanation.append(f"Allocating {pages_needed} pages for {process.name} ({process.size}KB)")
                 
-                # Find free frames
-                for page_num in range(pages_needed):
-                    frame_found = False
-                    for frame in frames:
-                        if not frame.is_allocated:
-                            frame.is_allocated = True
-                            frame.process_id = process.id
-                            frame.page_number = page_num
-                            
-                            # Create page table entry
-                            page_entry = PageTableEntry(
-                                page_number=page_num,
-                                frame_number=frame.frame_number,
-                                present=True
-                            )
-                            page_table.append(page_entry)
-                            
-                            allocated_pages += 1
-                            frame_found = True
-                            page_hits += 1
-                            break
-                    
-                    if not frame_found:
-                        page_faults += 1
-                        explanation.append(f"Page fault for page {page_num} of {process.name}")
+                # Pages beyond the free frames left all fault, so split the range once
+                allocated_pages = min(pages_needed, len(free_frames))
+                
+                # Frame number of each resident page, indexed by page number
+                page_table = [free_frames.popleft() for _ in range(allocated_pages)]
+                
+                for page_num, frame_number in enumerate(page_table):
+                    frame = frames[frame_number]
+                    frame.is_allocated = True
+                    frame.process_id = process.id
+                    frame.page_number = page_num
+                    frame_layout[frame_number] = {
+                        "frame_number": frame_number,
+                        "allocated": True,
+                        "process_id": process.id,
+                        "page_number": page_num
+                    }
+                
+                faulted_pages = pages_needed - allocated_pages
+                page_hits += allocated_pages
+                page_faults += faulted_pages
+                explanation.extend(
+                    f"Page fault for page {page_num} of {process.name}"
+                    for page_num in range(allocated_pages, pages_needed)
+                )
                 
                 if allocated_pages > 0:
                     page_tables[process.id] = page_table
                     successful_allocations += allocated_pages
                     
                     # Create allocation event
-                    event = AllocationEvent(
+                    if emit_timeline:
+                        event = AllocationEvent(
+                            time=process.arrival_time,
+                            event_type="allocate",
+                            process_id=process.id,
+                            process_name=process.name,
+                            size=process.size,
+                            address=0,  # Virtual address starts at 0
+                            success=True,
+                            description=f"Allocated {allocated_pages} pages for {process.name}" if include_descriptions else "",
+                            page_number=0,
+                            frame_number=page_table[0] if page_table else None
+                        )
+                        events.append(event)
+                    
+                    explanation.append(f"✓ Allocated {allocated_pages}/{pages_needed} pages for {process.name}")
+                
+                # Pages with no free frame left fault; record them from their first virtual page
+                if faulted_pages and emit_timeline:
+                    events.append(AllocationEvent(
                         time=process.arrival_time,
-                        event_type="allocate",
+                        event_type="page_fault",
                         process_id=process.id,
                         process_name=process.name,
-                        size=process.size,
-                        address=0,  # Virtual address starts at 0
-                        success=True,
-                        description=f"Allocated {allocated_pages} pages for {process.name}",
-                        page_number=0,
-                        frame_number=page_table[0].frame_number if page_table else None
-                    )
-                    events.append(event)
-                    
-                    explanation.append(f"✓ Allocated {allocated_pages}/{pages_needed} pages for {process.name}")
+                        size=faulted_pages * page_size,
+                        address=allocated_pages * page_size,
+                        success=False,
+                        description=f"{faulted_pages} page faults in {process.name}" if include_descriptions else "",
+                        page_number=allocated_pages,
+                        frame_number=None
+                    ))
                 
                 # Create memory state
-                state = MemoryState(
+                state = _construct(MemoryState,
                     time=process.arrival_time,
-                    memory_layout=[
-                        {
-                            "frame_number": f.frame_number,
-                            "allocated": f.is_allocated,
-                            "process_id": f.process_id,
-                            "page_number": f.page_number
-                        } for f in frames
-                    ],
-                    free_memory=sum(f.size for f in frames if not f.is_allocated),
-                    allocated_memory=sum(f.size for f in frames if f.is_allocated)
+                    memory_layout=frame_layout.copy(),
+                    free_memory=len(free_frames) * page_size,
+                    allocated_memory=(total_frames - len(free_frames)) * page_size
                 )
                 states.append(state)
             
-            # Add some page fault events for realism
-            for i in range(min(5, len(request.processes))):
-                fault_event = AllocationEvent(
-                    time=i * 2.0,
-                    event_type="page_fault",
-                    process_id=request.processes[i % len(request.processes)].id,
-                    process_name=request.processes[i % len(request.processes)].name,
-                    size=page_size,
-                    address=i * page_size * 10,
-                    success=False,
-                    description=f"Page fault in {request.processes[i % len(request.processes)].name}",
-                    page_number=i,
-                    frame_number=None
-                )
-                events.append(fault_event)
-            
             # Calculate metrics and create visualization
-            metrics = self._calculate_paging_metrics(frames, total_memory, page_faults, page_hits)
-            visualization = self._create_paging_visualization(frames, page_tables, events)
+            metrics = self._calculate_paging_metrics(total_frames - len(free_frames), page_size,
+                                                     total_memory, page_faults, page_hits)
+            visualization = self._create_paging_visualization(frames, page_tables, events, page_size)
             
             explanation.append(f"Paging simulation completed with {page_faults} page faults and {page_hits} page hits")
             
@@ -1015,6 +399,8 @@ class MemoryManagementService:
             
             segments = []
             events = []
+            emit_timeline = request.emit_timeline
+            include_descriptions = request.include_descriptions
             states = []
             explanation = []
             successful_allocations = 0
@@ -1026,17 +412,20 @@ class MemoryManagementService:
             current_address = 0
             
             # Process each process
-            for process in sorted(request.processes, key=lambda p: p.arrival_time):
+            for process in sorted(request.processes, key=_GET_ARRIVAL):
                 # Create segments for process (code, data, stack)
-                segment_types = ['code', 'data', 'stack']
                 process_segments = []
                 allocated = True
                 
-                for i, seg_type in enumerate(segment_types[:max_segments]):
-                    seg_size = process.size // len(segment_types)
-                    if i == len(segment_types) - 1:  # Last segment gets remainder
-                        seg_size = process.size - (seg_size * (len(segment_types) - 1))
-                    
+                # Segments are packed upward, so the first one starts at the current address
+                process_base = current_address
+                
+                # Split sizes once per process, the last segment gets the remainder
+                process_size = process.size
+                seg_sizes = [process_size // len(_SEGMENT_TYPES)] * len(_SEGMENT_TYPES)
+                seg_sizes[-1] = process_size - seg_sizes[0] * (len(_SEGMENT_TYPES) - 1)
+                
+                for seg_type, seg_size in zip(_SEGMENT_TYPES[:max_segments], seg_sizes):
                     if current_address + seg_size <= total_memory:
                         segment = Segment(
                             segment_id=len(segments),
@@ -1045,7 +434,7 @@ class MemoryManagementService:
                             base_address=current_address,
                             limit=current_address + seg_size,
                             size=seg_size,
-                            protection={'read': True, 'write': seg_type != 'code', 'execute': seg_type == 'code'}
+                            protection=_SEGMENT_PROTECTION[seg_type]
                         )
                         segments.append(segment)
                         process_segments.append(segment)
@@ -1057,17 +446,18 @@ class MemoryManagementService:
                         break
                 
                 # Create allocation event
-                event = AllocationEvent(
-                    time=process.arrival_time,
-                    event_type="allocate" if allocated else "allocation_failed",
-                    process_id=process.id,
-                    process_name=process.name,
-                    size=process.size,
-                    address=process_segments[0].base_address if process_segments else 0,
-                    success=allocated,
-                    description=f"{'Allocated' if allocated else 'Failed to allocate'} {len(process_segments)} segments for {process.name}"
-                )
-                events.append(event)
+                if emit_timeline:
+                    event = AllocationEvent(
+                        time=process.arrival_time,
+                        event_type="allocate" if allocated else "allocation_failed",
+                        process_id=process.id,
+                        process_name=process.name,
+                        size=process.size,
+                        address=process_base if process_segments else 0,
+                        success=allocated,
+                        description=f"{'Allocated' if allocated else 'Failed to allocate'} {len(process_segments)} segments for {process.name}" if include_descriptions else ""
+                    )
+                    events.append(event)
                 
                 if allocated:
                     explanation.append(f"✓ Allocated {len(process_segments)} segments for {process.name}")
@@ -1075,9 +465,9 @@ class MemoryManagementService:
                     explanation.append(f"✗ Failed to allocate segments for {process.name}")
             
             # Calculate metrics
-            allocated_memory = sum(seg.size for seg in segments)
+            allocated_memory = sum(map(_GET_SIZE, segments))
             free_memory = total_memory - allocated_memory
-            memory_utilization = (allocated_memory / total_memory) * 100
+            memory_utilization = 100.0 * allocated_memory / (total_memory or 1)
             
             metrics = MemoryMetrics(
                 total_memory=total_memory,
@@ -1113,18 +503,13 @@ class MemoryManagementService:
             total_frames = total_memory // page_size
             
             # Initialize frames
-            frames = []
-            for i in range(total_frames):
-                frames.append(Frame(
-                    frame_number=i,
-                    size=page_size,
-                    is_allocated=False,
-                    process_id=None,
-                    page_number=None
-                ))
+            frames = self._create_frames(total_frames, page_size)
             
+            free_frames = deque(range(total_frames))
             multi_level_page_tables = {}
             events = []
+            emit_timeline = request.emit_timeline
+            include_descriptions = request.include_descriptions
             states = []
             explanation = []
             page_faults = 0
@@ -1135,52 +520,48 @@ class MemoryManagementService:
             explanation.append(f"Total frames: {total_frames}, Page size: {page_size}KB")
             
             # Process each process
-            for process in sorted(request.processes, key=lambda p: p.arrival_time):
+            for process in sorted(request.processes, key=_GET_ARRIVAL):
                 pages_needed = (process.size + page_size - 1) // page_size
-                allocated_pages = 0
                 
                 # Create multi-level page table structure
                 page_table = self._create_multilevel_page_table(pages_needed, levels, process.id)
                 
                 explanation.append(f"Creating {levels}-level page table for {process.name}")
                 
-                # Allocate frames
-                for page_num in range(pages_needed):
-                    frame_found = False
-                    for frame in frames:
-                        if not frame.is_allocated:
-                            frame.is_allocated = True
-                            frame.process_id = process.id
-                            frame.page_number = page_num
-                            allocated_pages += 1
-                            page_hits += 1
-                            frame_found = True
-                            break
-                    
-                    if not frame_found:
-                        page_faults += 1
+                # Allocate frames, pages beyond the free frames left all fault
+                allocated_pages = min(pages_needed, len(free_frames))
+                for page_num in range(allocated_pages):
+                    frame = frames[free_frames.popleft()]
+                    frame.is_allocated = True
+                    frame.process_id = process.id
+                    frame.page_number = page_num
+                
+                page_hits += allocated_pages
+                page_faults += pages_needed - allocated_pages
                 
                 if allocated_pages > 0:
-                    multi_level_page_tables[process.id] = page_table
+                    multi_level_page_tables[str(process.id)] = page_table
                     successful_allocations += allocated_pages
                     
-                    event = AllocationEvent(
-                        time=process.arrival_time,
-                        event_type="allocate",
-                        process_id=process.id,
-                        process_name=process.name,
-                        size=process.size,
-                        address=0,
-                        success=True,
-                        description=f"Allocated {allocated_pages} pages with {levels}-level paging for {process.name}"
-                    )
-                    events.append(event)
+                    if emit_timeline:
+                        event = AllocationEvent(
+                            time=process.arrival_time,
+                            event_type="allocate",
+                            process_id=process.id,
+                            process_name=process.name,
+                            size=process.size,
+                            address=0,
+                            success=True,
+                            description=f"Allocated {allocated_pages} pages with {levels}-level paging for {process.name}" if include_descriptions else ""
+                        )
+                        events.append(event)
                     
                     explanation.append(f"✓ Allocated {allocated_pages} pages for {process.name}")
             
             # Calculate metrics
-            metrics = self._calculate_paging_metrics(frames, total_memory, page_faults, page_hits)
-            visualization = self._create_multilevel_paging_visualization(frames, multi_level_page_tables, events, levels)
+            metrics = self._calculate_paging_metrics(total_frames - len(free_frames), page_size,
+                                                     total_memory, page_faults, page_hits)
+            visualization = self._create_multilevel_paging_visualization(frames, multi_level_page_tables, events, page_size)
             
             explanation.append(f"Multi-level paging completed with {levels} levels")
             
@@ -1189,103 +570,50 @@ class MemoryManagementService:
         except Exception as e:
             raise Exception(f"Multi-level paging simulation failed: {str(e)}")
     
-    def _find_suitable_block(self, blocks: List[MemoryBlock], size: int, method: MemoryAllocationMethod) -> Optional[MemoryBlock]:
-        """Find suitable memory block using specified allocation method"""
-        free_blocks = [block for block in blocks if not block.is_allocated and block.size >= size]
-        
-        if not free_blocks:
-            return None
-        
-        if method == MemoryAllocationMethod.FIRST_FIT:
-            return free_blocks[0]
-        elif method == MemoryAllocationMethod.BEST_FIT:
-            return min(free_blocks, key=lambda x: x.size)
-        elif method == MemoryAllocationMethod.WORST_FIT:
-            return max(free_blocks, key=lambda x: x.size)
-        elif method == MemoryAllocationMethod.NEXT_FIT:
-            return free_blocks[0]
-        
-        return None
+    def _create_frames(self, total_frames: int, page_size: int) -> List[_FrameRecord]:
+        """Create an empty frame table with every frame unallocated"""
+        return [_FrameRecord(i, page_size) for i in range(total_frames)]
     
-    def _compact_memory(self, blocks: List[MemoryBlock]) -> List[MemoryBlock]:
-        """Compact memory by moving all allocated blocks to the beginning"""
-        allocated_blocks = [block for block in blocks if block.is_allocated]
-        
-        current_address = 0
-        for block in allocated_blocks:
-            block.start_address = current_address
-            current_address += block.size
-        
-        total_memory = sum(block.size for block in blocks)
-        remaining_size = total_memory - current_address
-        
-        if remaining_size > 0:
-            free_block = MemoryBlock(
-                id=max(block.id for block in blocks) + 1,
-                start_address=current_address,
-                size=remaining_size,
-                is_allocated=False
-            )
-            allocated_blocks.append(free_block)
-        
-        return allocated_blocks
-    
-    def _page_replacement(self, frames: List[Frame], algorithm: ReplacementAlgorithm, process_id: int) -> Optional[Frame]:
-        """Implement page replacement algorithms"""
-        allocated_frames = [frame for frame in frames if frame.is_allocated]
-        
-        if not allocated_frames:
-            return None
-        
-        if algorithm == ReplacementAlgorithm.FIFO:
-            victim_frame = allocated_frames[0]
-        elif algorithm == ReplacementAlgorithm.LRU:
-            victim_frame = allocated_frames[0]
+    def _place_process(self, run: _LinearRun, blocks: List[_BlockRecord], free_blocks: List[_BlockRecord],
+                       free_idx: int, process: Process) -> _BlockRecord:
+        """Allocate free_blocks[free_idx] to process, splitting off any remainder"""
+        block = free_blocks[free_idx]
+        # Nothing is ever freed, so the chosen block is usually the free region at the top of memory
+        pos = len(blocks) - 1 if blocks[-1] is block else blocks.index(block)
+        del run.free_sizes[bisect_left(run.free_sizes, (block.size, block.start_address))]
+        if block.size > process.size:
+            # Split block, the remainder takes its slot in the free list
+            new_block = _BlockRecord(id=run.next_block_id, start_address=block.start_address + process.size,
+                                     size=block.size - process.size)
+            run.next_block_id += 1
+            blocks.insert(pos + 1, new_block)
+            run.block_layout.insert(pos + 1, _block_layout_row(new_block))
+            free_blocks[free_idx] = new_block
+            insort(run.free_sizes, (new_block.size, new_block.start_address))
         else:
-            victim_frame = allocated_frames[0]
-        
-        victim_frame.is_allocated = False
-        victim_frame.page_number = None
-        victim_frame.process_id = None
-        
-        victim_frame.is_allocated = True
-        victim_frame.process_id = process_id
-        
-        return victim_frame
+            del free_blocks[free_idx]
+        
+        block.size = process.size
+        block.is_allocated = True
+        block.process_id = process.id
+        block.process_name = process.name
+        run.block_layout[pos] = _block_layout_row(block)
+        return block
     
-    def _create_memory_state(self, blocks: List[MemoryBlock], time: float) -> MemoryState:
-        """Create memory state snapshot"""
-        allocated_memory = sum(block.size for block in blocks if block.is_allocated)
-        total_memory = sum(block.size for block in blocks)
-        free_memory = total_memory - allocated_memory
-        
-        free_blocks = [block for block in blocks if not block.is_allocated]
-        external_frag = len(free_blocks) - 1 if len(free_blocks) > 1 else 0
-        
-        return MemoryState(
-            time=time,
-            memory_blocks=blocks.copy(),
-            allocated_memory=allocated_memory,
-            free_memory=free_memory,
-            fragmentation={"external": external_frag, "internal": 0},
-            processes=[
-                {"id": block.process_id, "name": block.process_name, "size": block.size}
-                for block in blocks if block.is_allocated and block.process_id != -1
-            ]
-        )
+    def _fit_strategy(self, method: MemoryAllocationMethod, run: _LinearRun):
+        """Resolve the block finder for an allocation method"""
+        if method == MemoryAllocationMethod.NEXT_FIT:
+            return run.next_fit
+        return _FIT_STRATEGIES[method]
     
-    def _calculate_linear_metrics(self, blocks: List[MemoryBlock], total_memory: int, 
-                                failed_allocations: int, successful_allocations: int, 
+    def _calculate_linear_metrics(self, allocated_memory: int, total_free: int, largest_free: int,
+                                total_memory: int, failed_allocations: int, successful_allocations: int, 
                                 total_time: float) -> MemoryMetrics:
-        """Calculate metrics for linear allocation"""
-        allocated_memory = sum(block.size for block in blocks if block.is_allocated)
+        """Calculate metrics for linear allocation from the run's memory totals"""
         free_memory = total_memory - allocated_memory
-        memory_utilization = (allocated_memory / total_memory) * 100
+        memory_utilization = 100.0 * allocated_memory / (total_memory or 1)
         
         # Calculate external fragmentation
-        free_blocks = [block for block in blocks if not block.is_allocated]
-        total_free = sum(block.size for block in free_blocks)
-        largest_free = max((block.size for block in free_blocks), default=0)
         external_fragmentation = ((total_free - largest_free) / total_free * 100) if total_free > 0 else 0
         
         # Internal fragmentation is minimal for linear allocation
@@ -1310,7 +638,8 @@ class MemoryManagementService:
             hit_ratio=0.0
         )
 
-    def _create_linear_visualization(self, blocks: List[MemoryBlock], events: List[AllocationEvent]) -> MemoryVisualization:
+    def _create_linear_visualization(self, blocks: List[_BlockRecord], free_blocks: List[_BlockRecord],
+                                     events: List[AllocationEvent]) -> MemoryVisualization:
         """Create visualization data for linear allocation"""
         memory_map = []
         for block in blocks:
@@ -1325,7 +654,6 @@ class MemoryManagementService:
             })
         
         fragmentation_chart = []
-        free_blocks = [block for block in blocks if not block.is_allocated]
         for i, block in enumerate(free_blocks):
             fragmentation_chart.append({
                 "block_id": i,
@@ -1333,26 +661,25 @@ class MemoryManagementService:
                 "start": block.start_address
             })
         
-        return MemoryVisualization(
+        return _construct(MemoryVisualization,
             memory_map=memory_map,
             timeline=events,
             fragmentation_chart=fragmentation_chart
         )
 
-    def _calculate_paging_metrics(self, frames: List[Frame], total_memory: int, 
+    def _calculate_paging_metrics(self, allocated_frames: int, page_size: int, total_memory: int, 
                                  page_faults: int, page_hits: int) -> MemoryMetrics:
         """Calculate metrics for paging"""
-        allocated_frames = sum(1 for frame in frames if frame.is_allocated)
-        allocated_memory = allocated_frames * (frames[0].size if frames else 4)
+        allocated_memory = allocated_frames * page_size
         free_memory = total_memory - allocated_memory
-        memory_utilization = (allocated_memory / total_memory) * 100
+        memory_utilization = 100.0 * allocated_memory / (total_memory or 1)
         
         # Paging has minimal external fragmentation
         external_fragmentation = 2.0
         # But can have internal fragmentation
         internal_fragmentation = 15.0
         
-        hit_ratio = (page_hits / max(page_hits + page_faults, 1)) * 100
+        hit_ratio = 100.0 * page_hits / ((page_hits + page_faults) or 1)
         
         return MemoryMetrics(
             total_memory=total_memory,
@@ -1371,80 +698,62 @@ class MemoryManagementService:
             hit_ratio=hit_ratio
         )
 
-    def _create_paging_visualization(self, frames: List[Frame], page_tables: Dict, 
-                                   events: List[AllocationEvent]) -> MemoryVisualization:
-        """Create visualization for paging"""
-        memory_map = []
-        for frame in frames:
-            memory_map.append({
+    def _frame_memory_map(self, frames: List[_FrameRecord], size: int) -> List[Dict[str, Any]]:
+        """Build the per-frame memory map shared by the paging visualizations"""
+        # Frames are uniform and numbered by position, so starts step by the frame size
+        return [
+            {
                 "frame_number": frame.frame_number,
-                "start": frame.frame_number * frame.size,
-                "end": (frame.frame_number + 1) * frame.size - 1,
-                "size": frame.size,
+                "start": start,
+                "end": start + size - 1,
+                "size": size,
                 "allocated": frame.is_allocated,
                 "process_id": frame.process_id,
                 "page_number": frame.page_number,
                 "type": "allocated" if frame.is_allocated else "free"
-            })
-        
-        page_table_list = []
-        for process_id, table in page_tables.items():
-            for entry in table:
-                page_table_list.append({
-                    "process_id": process_id,
-                    "page_number": entry.page_number,
-                    "frame_number": entry.frame_number,
-                    "present": entry.present
-                })
+            }
+            for start, frame in zip(range(0, len(frames) * size, size), frames)
+        ]
+
+    def _create_paging_visualization(self, frames: List[_FrameRecord], page_tables: Dict[int, List[int]], 
+                                   events: List[AllocationEvent], page_size: int) -> MemoryVisualization:
+        """Create visualization for paging"""
+        page_table_list = [
+            {
+                "process_id": process_id,
+                "page_number": page_number,
+                "frame_number": frame_number,
+                "present": True
+            }
+            for process_id, table in page_tables.items()
+            for page_number, frame_number in enumerate(table)
+        ]
         
-        return MemoryVisualization(
-            memory_map=memory_map,
+        return _construct(MemoryVisualization,
+            memory_map=self._frame_memory_map(frames, page_size),
             page_table=page_table_list,
             timeline=events,
             fragmentation_chart=[]
         )
 
-    def _create_paging_state(self, frames: List[Frame], page_tables: Dict, time: float) -> MemoryState:
-        """Create paging state snapshot"""
-        allocated_memory = sum(frame.size for frame in frames if frame.is_allocated)
-        total_memory = sum(frame.size for frame in frames)
-        free_memory = total_memory - allocated_memory
-        
-        return MemoryState(
-            time=time,
-            memory_layout=[
-                {
-                    "frame_number": f.frame_number,
-                    "allocated": f.is_allocated,
-                    "process_id": f.process_id,
-                    "page_number": f.page_number
-                } for f in frames
-            ],
-            free_memory=free_memory,
-            allocated_memory=allocated_memory,
-            fragmentation={"external": 0, "internal": 5.0},
-            processes=[
-                {"id": f.process_id, "name": f"Process {f.process_id}", "size": f.size}
-                for f in frames if f.is_allocated and f.process_id != -1
-            ]
-        )
-    
     def _create_segmentation_visualization(self, segments: List[Segment], events: List[AllocationEvent]) -> MemoryVisualization:
         """Create visualization for segmentation"""
-        memory_map = []
-        for segment in segments:
-            memory_map.append({
-                "segment_id": segment.id,
-                "start": segment.base_address,
-                "end": segment.limit,
-                "size": segment.size,
+        # Every placed segment is allocated, so only the per-segment fields vary
+        memory_map = [
+            {
+                "segment_id": segment_id,
+                "start": start,
+                "end": end,
+                "size": size,
                 "allocated": True,
-                "process_id": segment.process_id,
-                "segment_type": segment.segment_type,
+                "process_id": process_id,
+                "segment_type": segment_type,
                 "type": "allocated"
-            })
+            }
+            for segment_id, start, end, size, process_id, segment_type in map(_SEGMENT_FIELDS, segments)
+        ]
         
-        return MemoryVisualization(
+        return _construct(MemoryVisualization,
             memory_map=memory_map,
             segment_table=segments,
             timeline=events,
@@ -1453,40 +762,27 @@ class MemoryManagementService:
     
     def _create_multilevel_page_table(self, pages_needed: int, levels: int, process_id: int) -> Dict:
         """Create multi-level page table structure"""
-        page_table = {
+        if levels <= len(_LEVEL_KEYS):
+            level_keys = _LEVEL_KEYS[:levels]
+        else:
+            level_keys = [f"level_{level}" for level in range(levels)]
+        
+        # Create hierarchical structure, each level indexing 4x fewer entries (a 2-bit shift)
+        return {
             "levels": levels,
             "process_id": process_id,
             "pages_needed": pages_needed,
-            "structure": {}
-        }
-        
-        # Create hierarchical structure
-        for level in range(levels):
-            page_table["structure"][f"level_{level}"] = {
-                "entries": [],
-                "size": pages_needed // (4 ** level)
+            "structure": {
+                key: {"entries": [], "size": pages_needed >> (2 * level)}
+                for level, key in enumerate(level_keys)
             }
-        
-        return page_table
+        }
     
-    def _create_multilevel_paging_visualization(self, frames: List[Frame], page_tables: Dict, 
-                                             events: List[AllocationEvent], levels: int) -> MemoryVisualization:
+    def _create_multilevel_paging_visualization(self, frames: List[_FrameRecord], page_tables: Dict, 
+                                             events: List[AllocationEvent], page_size: int) -> MemoryVisualization:
         """Create visualization for multi-level paging"""
-        memory_map = []
-        for frame in frames:
-            memory_map.append({
-                "frame_number": frame.frame_number,
-                "start": frame.frame_number * frame.size,
-                "end": (frame.frame_number + 1) * frame.size - 1,
-                "size": frame.size,
-                "allocated": frame.is_allocated,
-                "process_id": frame.process_id,
-                "page_number": frame.page_number,
-                "type": "allocated" if frame.is_allocated else "free"
-            })
-        
-        return MemoryVisualization(
-            memory_map=memory_map,
+        return _construct(MemoryVisualization,
+            memory_map=self._frame_memory_map(frames, page_size),
             timeline=events,
             fragmentation_chart=[],
             multi_level_tables=page_tables
@@ -1,22 +1,173 @@
 import time
 import random
-from typing import Dict, List, Any
+from collections import defaultdict, deque
+from itertools import islice
+from typing import Deque, Dict, List, Any, Optional, Tuple
 from app.models.process import (
     Process, ProcessState, TrapType, TrapTableEntry, 
     SystemCall
 )
 
+# Enum members looked up through the class are slow to fetch, so loops compare against these
+_RUNNING = ProcessState.RUNNING
+_BLOCKED = ProcessState.BLOCKED
+_TERMINATED = ProcessState.TERMINATED
+
+# kill signals: display name, and the resulting state with the verb for the report
+_SIGNAL_NAMES = {9: "KILL", 15: "TERM", 19: "STOP", 18: "CONT"}
+_SIGNAL_ACTIONS = {
+    9: (_TERMINATED, "terminated"),
+    15: (_TERMINATED, "terminated"),
+    19: (_BLOCKED, "stopped"),
+    18: (ProcessState.READY, "continued"),
+}
+
+def _parse_pid(text: str) -> Optional[int]:
+    """PID given as a command argument, or None if it is not an integer"""
+    try:
+        return int(text)
+    except ValueError:
+        return None
+
+# Trap info for ps never varies, so every response shares it
+_PS_TRAP_INFO = {
+    "trap_type": "system_call",
+    "description": "Process listing system call executed"
+}
+
+# Static command outputs, built once at import
+_HELP_OUTPUT = """
+PROCESS MANAGEMENT:
+  ps [options]            - List processes (-a for all, -f for tree, -u for user info)
+  top                     - Display running processes
+  pstree                  - Show process tree
+  fork <name>             - Create a new process
+  kill [-sig] pid         - Terminate/signal a process (signals: 9=KILL, 15=TERM, 19=STOP, 18=CONT)
+  wait <pid>              - Wait for process completion
+  sleep <pid>             - Put process to sleep
+  exit                    - Exit information
+
+SYSTEM INFORMATION:
+  uptime                  - Show system uptime and load
+  free [-h]               - Display memory usage
+  uname [-a|-r|-s|-n|-m]  - System information
+  whoami                  - Current user
+  id                      - User and group IDs
+
+PROCESS UTILITIES:
+  pgrep <name>            - Find processes by name
+  pkill <name>            - Kill processes by name
+  killall <name>          - Kill all processes with name
+
+SYSTEM CALLS & TRAPS:
+  trap                    - Show trap table and system calls
+
+TERMINAL & UTILITIES:
+  history                 - Command history
+  alias [name]            - Show or create command alias
+  unalias <name>          - Remove alias
+  env                     - Show environment variables
+  clear                   - Clear terminal (Ctrl+L)
+
+EXAMPLES:
+  fork webserver          - Creates process named 'webserver'
+  kill -9 123             - Force kill process 123
+  ps -a                   - Show all processes
+  ps -f                   - Show process tree
+  free -h                 - Human readable memory info
+  alias ll='ls -l'        - Create alias (view with 'alias')
+  pgrep init              - Find processes containing 'init'
+  sleep 123               - Put process 123 to sleep
+  uname -a                - Show all system info
+  
+AVAILABLE ALIASES:
+  h → help
+  p → ps
+        """
+
+_LS_ROOT_OUTPUT = (
+    "total 8\n"
+    "drwxr-xr-x  2 user user 4096 Jan 01 12:00 bin\n"
+    "drwxr-xr-x  2 user user 4096 Jan 01 12:00 etc\n"
+    "drwxr-xr-x  2 user user 4096 Jan 01 12:00 home\n"
+    "drwxr-xr-x  2 user user 4096 Jan 01 12:00 proc\n"
+    "drwxr-xr-x  2 user user 4096 Jan 01 12:00 tmp\n"
+    "drwxr-xr-x  2 user user 4096 Jan 01 12:00 usr\n"
+    "drwxr-xr-x  2 user user 4096 Jan 01 12:00 var\n"
+)
+
+_ENV_OUTPUT = (
+    "PATH=/usr/local/bin:/usr/bin:/bin\n"
+    "HOME=/home/user\n"
+    "USER=user\n"
+    "SHELL=/bin/bash\n"
+    "PWD=/home/user\n"
+    "TERM=xterm-256color\n"
+)
+
 class ProcessManager:
     def __init__(self):
         self.processes: Dict[int, Process] = {}
+        # PIDs per exact process name, in creation order; processes are never removed
+        self._pids_by_name: Dict[str, List[int]] = defaultdict(list)
+        # Lowercased (name, command) per PID for pgrep/pkill, computed once at creation
+        self._search_keys: Dict[int, Tuple[str, str]] = {}
+        # Memory of every process in the table; usage is fixed at creation and terminated processes still count
+        self._memory_used = 0
         self.next_pid = 1
         self.current_time = 0
-        self.system_calls: List[SystemCall] = []
+        # Bounded logs drop their oldest entry on append instead of being re-sliced.
+        # System calls are kept as (name, args, timestamp, pid) and only become models when read
+        self.system_calls: Deque[Tuple[str, List[str], float, int]] = deque(maxlen=100)
         self.trap_table = self._initialize_trap_table()
-        self.command_history: List[str] = []
-        self.aliases: Dict[str, str] = {
-            'h': 'help',
-            'p': 'ps'
+        # The trap table never changes, so its dicts and the static part of 'trap' are built once
+        self._trap_table_dicts = [entry.dict() for entry in self.trap_table]
+        self._trap_table_text = self._format_trap_table()
+        self.command_history: Deque[str] = deque(maxlen=1000)
+        # Alias expansions are stored already split into command and arguments
+        self.aliases: Dict[str, Tuple[str, ...]] = {
+            'h': ('help',),
+            'p': ('ps',)
+        }
+        # Shared by every command response, rebuilt only when a process is added
+        self._process_snapshot: Optional[Tuple[Process, ...]] = None
+        # 'ls /proc' body, invalidated together with the snapshot
+        self._proc_listing: Optional[str] = None
+        # Bumped whenever a process is added or changes state; ps rows are cached per generation
+        self._generation = 0
+        self._ps_rows: Dict[bool, Tuple[int, str]] = {}
+        
+        # Built once so dispatch is a single lookup per command
+        self._command_map = {
+            'ps': self._cmd_ps,
+            'fork': self._cmd_fork,
+            'kill': self._cmd_kill,
+            'wait': self._cmd_wait,
+            'sleep': self._cmd_sleep,
+            'exit': self._cmd_exit,
+            'pstree': self._cmd_pstree,
+            
+            'trap': self._cmd_trap,
+            'help': self._cmd_help,
+            'top': self._cmd_top,
+            'uptime': self._cmd_uptime,
+            'free': self._cmd_free,
+            'whoami': self._cmd_whoami,
+            'id': self._cmd_id,
+            'uname': self._cmd_uname,
+            
+            'pgrep': self._cmd_pgrep,
+            'pkill': self._cmd_pkill,
+            'killall': self._cmd_killall,
+            
+            'history': self._cmd_history,
+            'alias': self._cmd_alias,
+            'env': self._cmd_env,
+            'clear': self._cmd_clear,
+            
+            'ls': self._cmd_ls,
+            'pwd': self._cmd_pwd,
+            'cd': self._cmd_cd,
         }
         
         self._create_kernel_process()
@@ -24,15 +175,33 @@ class ProcessManager:
     
     def get_all_processes(self):
         """Get all processes - used by endpoints"""
-        return list(self.processes.values())
+        return self._snapshot()
+    
+    def _snapshot(self) -> Tuple[Process, ...]:
+        """Processes for command responses, cached until the process table changes"""
+        # Processes are never removed and state changes mutate them in place, so only new PIDs invalidate this
+        if self._process_snapshot is None:
+            self._process_snapshot = tuple(self.processes.values())
+        return self._process_snapshot
     
     def get_trap_table(self):
         """Get the trap table - used by endpoints"""
         return self.trap_table
     
+    def get_trap_table_dicts(self):
+        """Get the trap table as plain dicts - used by endpoints"""
+        return self._trap_table_dicts
+    
     def get_recent_system_calls(self, count: int = 10):
         """Get recent system calls - used by endpoints"""
-        return self.system_calls[-count:] if self.system_calls else []
+        return [
+            SystemCall(name=name, args=args, timestamp=timestamp, pid=pid)
+            for name, args, timestamp, pid in self._recent_call_tuples(count)
+        ]
+    
+    def _recent_call_tuples(self, count: int) -> List[Tuple[str, List[str], float, int]]:
+        """The last count logged system calls as (name, args, timestamp, pid), oldest first"""
+        return list(self.system_calls)[-count:]
     
     def _initialize_trap_table(self) -> List[TrapTableEntry]:
         """Initialize the trap table with common trap handlers"""
@@ -70,13 +239,13 @@ class ProcessManager:
             pid=0,
             ppid=None,
             name="[kernel]",
-            state=ProcessState.RUNNING,
+            state=_RUNNING,
             priority=10,
             start_time=time.time(),
             command="[kernel]",
             memory_usage=8192
         )
-        self.processes[0] = kernel_process
+        self._register_process(kernel_process)
     
     def _create_init_process(self):
         """Create the init process (PID 1)"""
@@ -84,139 +253,57 @@ class ProcessManager:
             pid=1,
             ppid=0,
             name="init",
-            state=ProcessState.RUNNING,
+            state=_RUNNING,
             priority=1,
             start_time=time.time(),
             command="/sbin/init",
             memory_usage=4096
         )
-        self.processes[1] = init_process
+        self._register_process(init_process)
         self.processes[0].children.append(1)
         self.next_pid = 2
     
+    def _register_process(self, process: Process):
+        """Add a process to the table and the name index"""
+        self.processes[process.pid] = process
+        self._pids_by_name[process.name].append(process.pid)
+        self._search_keys[process.pid] = (process.name.lower(), process.command.lower())
+        self._memory_used += process.memory_usage
+        self._process_snapshot = None
+        self._proc_listing = None
+        self._generation += 1
+    
     def _log_system_call(self, call_name: str, args: List[str]):
         """Log a system call"""
-        system_call = SystemCall(
-            name=call_name,
-            args=args,
-            timestamp=time.time(),
-            pid=1
-        )
-        self.system_calls.append(system_call)
-        if len(self.system_calls) > 100:
-            self.system_calls = self.system_calls[-100:]
+        self.system_calls.append((call_name, args, time.time(), 1))
     
     def execute_command(self, command: str, args: List[str]) -> Dict[str, Any]:
         """Execute a terminal command and return the result"""
-        self.current_time = time.time()
-        
         full_command = f"{command} {' '.join(args)}".strip()
         if command in self.aliases:
-            alias_parts = self.aliases[command].split()
-            command = alias_parts[0]
-            args = alias_parts[1:] + args
+            command, *alias_args = self.aliases[command]
+            args = alias_args + args
         
         self.command_history.append(full_command)
-        if len(self.command_history) > 1000:
-            self.command_history = self.command_history[-1000:]
-        
-        self._log_system_call("exec", [command] + args)
         
-        command_map = {
-            'ps': self._cmd_ps,
-            'fork': self._cmd_fork,
-            'kill': self._cmd_kill,
-            'wait': self._cmd_wait,
-            'sleep': self._cmd_sleep,
-            'exit': self._cmd_exit,
-            'pstree': self._cmd_pstree,
-            
-            'trap': self._cmd_trap,
-            'help': self._cmd_help,
-            'top': self._cmd_top,
-            'uptime': self._cmd_uptime,
-            'free': self._cmd_free,
-            'whoami': self._cmd_whoami,
-            'id': self._cmd_id,
-            'uname': self._cmd_uname,
-            
-            'pgrep': self._cmd_pgrep,
-            'pkill': self._cmd_pkill,
-            'killall': self._cmd_killall,
-            
-            'history': self._cmd_history,
-            'alias': self._cmd_alias,
-            'env': self._cmd_env,
-            'clear': self._cmd_clear,
-            
-            'ls': self._cmd_ls,
-            'pwd': self._cmd_pwd,
-            'cd': self._cmd_cd,
-        }
-        
-        if command in command_map:
-            return command_map[command](args)
-        else:
+        # Unknown commands never reach a handler, so they skip the clock read and the exec log
+        handler = self._command_map.get(command)
+        if handler is None:
             return {
                 "output": f"Command '{command}' not found. Type 'help' for available commands.\n",
-                "processes": list(self.processes.values()),
+                "processes": self._snapshot(),
                 "error": f"Unknown command: {command}"
             }
+        
+        self.current_time = time.time()
+        self._log_system_call("exec", [command] + args)
+        return handler(args)
     
     def _cmd_help(self, args: List[str]) -> Dict[str, Any]:
         """Show available commands"""
-        output = """
-PROCESS MANAGEMENT:
-  ps [options]            - List processes (-a for all, -f for tree, -u for user info)
-  top                     - Display running processes
-  pstree                  - Show process tree
-  fork <name>             - Create a new process
-  kill [-sig] pid         - Terminate/signal a process (signals: 9=KILL, 15=TERM, 19=STOP, 18=CONT)
-  wait <pid>              - Wait for process completion
-  sleep <pid>             - Put process to sleep
-  exit                    - Exit information
-
-SYSTEM INFORMATION:
-  uptime                  - Show system uptime and load
-  free [-h]               - Display memory usage
-  uname [-a|-r|-s|-n|-m]  - System information
-  whoami                  - Current user
-  id                      - User and group IDs
-
-PROCESS UTILITIES:
-  pgrep <name>            - Find processes by name
-  pkill <name>            - Kill processes by name
-  killall <name>          - Kill all processes with name
-
-SYSTEM CALLS & TRAPS:
-  trap                    - Show trap table and system calls
-
-TERMINAL & UTILITIES:
-  history                 - Command history
-  alias [name]            - Show or create command alias
-  unalias <name>          - Remove alias
-  env                     - Show environment variables
-  clear                   - Clear terminal (Ctrl+L)
-
-EXAMPLES:
-  fork webserver          - Creates process named 'webserver'
-  kill -9 123             - Force kill process 123
-  ps -a                   - Show all processes
-  ps -f                   - Show process tree
-  free -h                 - Human readable memory info
-  alias ll='ls -l'        - Create alias (view with 'alias')
-  pgrep init              - Find processes containing 'init'
-  sleep 123               - Put process 123 to sleep
-  uname -a                - Show all system info
-  
-AVAILABLE ALIASES:
-  h → help
-  p → ps
-        """
-        
         return {
-            "output": output,
-            "processes": list(self.processes.values())
+            "output": _HELP_OUTPUT,
+            "processes": self._snapshot()
         }
 
     def _cmd_ls(self, args: List[str]) -> Dict[str, Any]:
@@ -224,42 +311,35 @@ AVAILABLE ALIASES:
         path = args[0] if args else "/"
         
         if path in ["/", "~", ""]:
-            output = "total 8\n"
-            output += "drwxr-xr-x  2 user user 4096 Jan 01 12:00 bin\n"
-            output += "drwxr-xr-x  2 user user 4096 Jan 01 12:00 etc\n"
-            output += "drwxr-xr-x  2 user user 4096 Jan 01 12:00 home\n"
-            output += "drwxr-xr-x  2 user user 4096 Jan 01 12:00 proc\n"
-            output += "drwxr-xr-x  2 user user 4096 Jan 01 12:00 tmp\n"
-            output += "drwxr-xr-x  2 user user 4096 Jan 01 12:00 usr\n"
-            output += "drwxr-xr-x  2 user user 4096 Jan 01 12:00 var\n"
+            output = _LS_ROOT_OUTPUT
         elif path == "/proc":
-            output = "Process information directory:\n"
-            for pid in self.processes.keys():
-                output += f"{pid}\n"
+            if self._proc_listing is None:
+                self._proc_listing = "".join(f"{pid}\n" for pid in self.processes)
+            output = "Process information directory:\n" + self._proc_listing
         else:
             output = f"ls: cannot access '{path}': No such file or directory\n"
         
-        return {"output": output, "processes": list(self.processes.values())}
+        return {"output": output, "processes": self._snapshot()}
     
     def _cmd_pwd(self, args: List[str]) -> Dict[str, Any]:
         """Print working directory (simulated)"""
-        return {"output": "/home/user\n", "processes": list(self.processes.values())}
+        return {"output": "/home/user\n", "processes": self._snapshot()}
     
     def _cmd_cd(self, args: List[str]) -> Dict[str, Any]:
         """Change directory (simulated)"""
         path = args[0] if args else "~"
-        return {"output": f"Changed to directory: {path}\n", "processes": list(self.processes.values())}
+        return {"output": f"Changed to directory: {path}\n", "processes": self._snapshot()}
     
     def _cmd_clear(self, args: List[str]) -> Dict[str, Any]:
         """Clear terminal"""
-        return {"output": "\033[2J\033[H", "processes": list(self.processes.values())}
+        return {"output": "\033[2J\033[H", "processes": self._snapshot()}
 
     def _cmd_fork(self, args: List[str]) -> Dict[str, Any]:
         """Create a new process (fork simulation)"""
         if not args:
             return {
                 "output": "Usage: fork <process_name>\nExample: fork webserver\n",
-                "processes": list(self.processes.values()),
+                "processes": self._snapshot(),
                 "error": "Missing process name"
             }
         
@@ -280,23 +360,25 @@ AVAILABLE ALIASES:
             command=command
         )
         
-        self.processes[self.next_pid] = new_process
+        self._register_process(new_process)
         
         if parent_pid in self.processes:
             self.processes[parent_pid].children.append(self.next_pid)
         
-        output = f"Process forked successfully!\n"
-        output += f"New PID: {self.next_pid}\n"
-        output += f"Parent PID: {parent_pid}\n"
-        output += f"Process name: {process_name}\n"
-        output += f"Command: {command}\n"
-        output += f"State: {new_process.state.value}\n"
+        output = (
+            f"Process forked successfully!\n"
+            f"New PID: {self.next_pid}\n"
+            f"Parent PID: {parent_pid}\n"
+            f"Process name: {process_name}\n"
+            f"Command: {command}\n"
+            f"State: {new_process.state.value}\n"
+        )
         
         self.next_pid += 1
         
         return {
             "output": output,
-            "processes": list(self.processes.values()),
+            "processes": self._snapshot(),
             "trap_info": {
                 "trap_type": "system_call",
                 "description": f"Fork system call created process {new_process.pid}"
@@ -314,39 +396,52 @@ AVAILABLE ALIASES:
         output = "PID\tPPID\tSTATE\t\tPRI\tNI\tMEM(KB)\tNAME\t\tCOMMAND\n"
         output += "-" * 80 + "\n"
         
-        processes_to_show = list(self.processes.values())
-        if not show_all:
-            processes_to_show = [p for p in processes_to_show if p.state != ProcessState.TERMINATED]
-        
-        for process in sorted(processes_to_show, key=lambda p: p.pid):
-            output += f"{process.pid}\t{process.ppid or '-'}\t{process.state.value[:10]}\t{process.priority}\t{process.memory_usage}\t{process.name[:12]}\t{process.command[:20]}\n"
+        # Rows only change when a process is added or changes state
+        cached = self._ps_rows.get(show_all)
+        if cached is not None and cached[0] == self._generation:
+            rows = cached[1]
+        else:
+            # PIDs are handed out in increasing order and never removed, so the table is already sorted by PID
+            processes_to_show = self._snapshot()
+            if not show_all:
+                processes_to_show = [p for p in processes_to_show if p.state != _TERMINATED]
+            
+            rows = "".join([
+                f"{process.pid}\t{process.ppid or '-'}\t{process.state.value[:10]}\t{process.priority}\t{process.memory_usage}\t{process.name[:12]}\t{process.command[:20]}\n"
+                for process in processes_to_show
+            ])
+            self._ps_rows[show_all] = (self._generation, rows)
+        output += rows
         
         return {
             "output": output,
-            "processes": list(self.processes.values()),
-            "trap_info": {
-                "trap_type": "system_call",
-                "description": "Process listing system call executed"
-            }
+            "processes": self._snapshot(),
+            "trap_info": _PS_TRAP_INFO
         }
 
     def _cmd_pstree(self, args: List[str]) -> Dict[str, Any]:
         """Show process tree"""
-        def build_tree(pid: int, indent: str = "", is_last: bool = True) -> str:
-            if pid not in self.processes:
-                return ""
-            
-            process = self.processes[pid]
-            connector = "└─" if is_last else "├─"
-            tree_output = f"{indent}{connector}{process.name}({pid})\n"
-            
-            children = process.children
-            for i, child_pid in enumerate(children):
-                is_last_child = i == len(children) - 1
+        def build_tree(root_pid: int) -> str:
+            # Depth-first with an explicit stack, collecting lines to join once
+            lines = []
+            stack = [(root_pid, "", True)]
+            while stack:
+                pid, indent, is_last = stack.pop()
+                if pid not in self.processes:
+                    continue
+                
+                process = self.processes[pid]
+                connector = "└─" if is_last else "├─"
+                lines.append(f"{indent}{connector}{process.name}({pid})\n")
+                
+                children = process.children
                 child_indent = indent + ("  " if is_last else "│ ")
-                tree_output += build_tree(child_pid, child_indent, is_last_child)
+                last_index = len(children) - 1
+                # Pushed in reverse so the first child is printed first
+                for i in range(last_index, -1, -1):
+                    stack.append((children[i], child_indent, i == last_index))
             
-            return tree_output
+            return "".join(lines)
         
         output = "Process Tree:\n"
         output += "=" * 40 + "\n"
@@ -354,7 +449,7 @@ AVAILABLE ALIASES:
         
         return {
             "output": output,
-            "processes": list(self.processes.values())
+            "processes": self._snapshot()
         }
 
     def _cmd_kill(self, args: List[str]) -> Dict[str, Any]:
@@ -362,7 +457,7 @@ AVAILABLE ALIASES:
         if not args:
             return {
                 "output": "Usage: kill [-signal] <pid>\nSignals: -9 (KILL), -15 (TERM), -19 (STOP), -18 (CONT)\n",
-                "processes": list(self.processes.values()),
+                "processes": self._snapshot(),
                 "error": "Missing PID"
             }
         
@@ -375,54 +470,50 @@ AVAILABLE ALIASES:
                 if len(args) < 2:
                     return {
                         "output": "Error: PID required after signal\n",
-                        "processes": list(self.processes.values()),
+                        "processes": self._snapshot(),
                         "error": "Missing PID after signal"
                     }
                 pid_arg = args[1]
             except ValueError:
                 return {
                     "output": f"Error: Invalid signal '{pid_arg}'\n",
-                    "processes": list(self.processes.values()),
+                    "processes": self._snapshot(),
                     "error": "Invalid signal"
                 }
         
-        try:
-            pid = int(pid_arg)
-        except ValueError:
+        pid = _parse_pid(pid_arg)
+        if pid is None:
             return {
                 "output": f"Error: Invalid PID '{pid_arg}'\n",
-                "processes": list(self.processes.values()),
+                "processes": self._snapshot(),
                 "error": "Invalid PID"
             }
         
         if pid not in self.processes:
             return {
                 "output": f"Error: No such process (PID {pid})\n",
-                "processes": list(self.processes.values()),
+                "processes": self._snapshot(),
                 "error": "Process not found"
             }
         
         if pid in [0, 1]:
             return {
                 "output": f"Error: Cannot kill system process (PID {pid})\n",
-                "processes": list(self.processes.values()),
+                "processes": self._snapshot(),
                 "error": "Cannot kill system process"
             }
         
         process = self.processes[pid]
-        signal_names = {9: "KILL", 15: "TERM", 19: "STOP", 18: "CONT"}
-        signal_name = signal_names.get(signal, str(signal))
-        
-        if signal == 9 or signal == 15:
-            process.state = ProcessState.TERMINATED
-            process.exit_code = signal
-            output = f"Process {pid} ({process.name}) terminated with signal {signal_name}\n"
-        elif signal == 19:
-            process.state = ProcessState.BLOCKED
-            output = f"Process {pid} ({process.name}) stopped with signal {signal_name}\n"
-        elif signal == 18:
-            process.state = ProcessState.READY
-            output = f"Process {pid} ({process.name}) continued with signal {signal_name}\n"
+        signal_name = _SIGNAL_NAMES.get(signal, str(signal))
+        
+        action = _SIGNAL_ACTIONS.get(signal)
+        if action is not None:
+            new_state, verb = action
+            process.state = new_state
+            self._generation += 1
+            if new_state is _TERMINATED:
+                process.exit_code = signal
+            output = f"Process {pid} ({process.name}) {verb} with signal {signal_name}\n"
         else:
             output = f"Signal {signal} sent to process {pid} ({process.name})\n"
         
@@ -430,100 +521,121 @@ AVAILABLE ALIASES:
         
         return {
             "output": output,
-            "processes": list(self.processes.values()),
+            "processes": self._snapshot(),
             "trap_info": {
                 "trap_type": "system_call",
                 "description": f"Kill signal {signal_name} sent to process {pid}"
             }
         }
 
-    def _cmd_trap(self, args: List[str]) -> Dict[str, Any]:
-        """Show trap table and recent system calls"""
+    def _format_trap_table(self) -> str:
+        """Static part of the trap command output: the trap table and the system call header"""
         output = "TRAP TABLE:\n"
         output += "=" * 60 + "\n"
         output += "Type\t\t\tHandler Address\t\t\tDescription\n"
         output += "-" * 60 + "\n"
         
-        for entry in self.trap_table:
-            output += f"{entry.trap_type.value[:20]}\t\t\t{entry.handler_address}\t\t\t{entry.description}\n"
+        output += "".join([
+            f"{entry.trap_type.value[:20]}\t\t\t{entry.handler_address}\t\t\t{entry.description}\n"
+            for entry in self.trap_table
+        ])
         
         output += "\nRECENT SYSTEM CALLS:\n"
         output += "=" * 60 + "\n"
         output += "Time\t\tPID\tCall\t\tArgs\n"
         output += "-" * 60 + "\n"
         
-        recent_calls = self.system_calls[-10:]
-        for call in recent_calls:
-            timestamp = time.strftime("%H:%M:%S", time.localtime(call.timestamp))
-            args_str = " ".join(call.args[:3])
-            output += f"{timestamp}\t\t{call.pid}\t\t{call.name[:10]}\t\t{args_str[:20]}\n"
+        return output
+    
+    def _cmd_trap(self, args: List[str]) -> Dict[str, Any]:
+        """Show trap table and recent system calls"""
+        output = self._trap_table_text
+        
+        recent_calls = self._recent_call_tuples(10)
+        strftime, localtime = time.strftime, time.localtime
+        rows = []
+        for name, call_args, call_time, pid in recent_calls:
+            timestamp = strftime("%H:%M:%S", localtime(call_time))
+            args_str = " ".join(call_args[:3])
+            rows.append(f"{timestamp}\t\t{pid}\t\t{name[:10]}\t\t{args_str[:20]}\n")
+        output += "".join(rows)
         
         return {
             "output": output,
-            "processes": list(self.processes.values())
+            "processes": self._snapshot()
         }
 
     def _cmd_wait(self, args: List[str]) -> Dict[str, Any]:
         if not args:
-            return {"output": "Usage: wait <pid>\n", "processes": list(self.processes.values())}
+            return {"output": "Usage: wait <pid>\n", "processes": self._snapshot()}
         
-        try:
-            pid = int(args[0])
-            if pid in self.processes:
-                process = self.processes[pid]
-                if process.state == ProcessState.TERMINATED:
-                    output = f"Process {pid} has already terminated with exit code {process.exit_code}\n"
-                else:
-                    output = f"Waiting for process {pid} ({process.name}) to complete...\n"
-                    process.state = ProcessState.TERMINATED
-                    process.exit_code = 0
-                    output += f"Process {pid} completed with exit code 0\n"
-            else:
-                output = f"No such process: {pid}\n"
-        except ValueError:
+        pid = _parse_pid(args[0])
+        if pid is None:
             output = "Invalid PID\n"
+        elif pid in self.processes:
+            process = self.processes[pid]
+            if process.state == _TERMINATED:
+                output = f"Process {pid} has already terminated with exit code {process.exit_code}\n"
+            else:
+                output = f"Waiting for process {pid} ({process.name}) to complete...\n"
+                process.state = _TERMINATED
+                process.exit_code = 0
+                self._generation += 1
+                output += f"Process {pid} completed with exit code 0\n"
+        else:
+            output = f"No such process: {pid}\n"
         
-        return {"output": output, "processes": list(self.processes.values())}
+        return {"output": output, "processes": self._snapshot()}
 
     def _cmd_sleep(self, args: List[str]) -> Dict[str, Any]:
         if not args:
-            return {"output": "Usage: sleep <pid>\n", "processes": list(self.processes.values())}
-        
-        try:
-            pid = int(args[0])
-            if pid in self.processes and pid not in [0, 1]:
-                self.processes[pid].state = ProcessState.BLOCKED
-                return {"output": f"Process {pid} put to sleep\n", "processes": list(self.processes.values())}
-            else:
-                return {"output": f"Cannot sleep process {pid}\n", "processes": list(self.processes.values())}
-        except ValueError:
-            return {"output": "Invalid PID\n", "processes": list(self.processes.values())}
+            return {"output": "Usage: sleep <pid>\n", "processes": self._snapshot()}
+        
+        pid = _parse_pid(args[0])
+        if pid is None:
+            return {"output": "Invalid PID\n", "processes": self._snapshot()}
+        if pid in self.processes and pid not in [0, 1]:
+            self.processes[pid].state = _BLOCKED
+            self._generation += 1
+            return {"output": f"Process {pid} put to sleep\n", "processes": self._snapshot()}
+        else:
+            return {"output": f"Cannot sleep process {pid}\n", "processes": self._snapshot()}
 
     def _cmd_exit(self, args: List[str]) -> Dict[str, Any]:
-        return {"output": "Use 'kill <pid>' to terminate processes or Ctrl+C to exit terminal\n", "processes": list(self.processes.values())}
+        return {"output": "Use 'kill <pid>' to terminate processes or Ctrl+C to exit terminal\n", "processes": self._snapshot()}
 
     def _cmd_top(self, args: List[str]) -> Dict[str, Any]:
         output = f"top - {time.strftime('%H:%M:%S')} up {int(self.current_time - self.processes[0].start_time)}s\n"
         output += f"Tasks: {len(self.processes)} total, "
-        running = len([p for p in self.processes.values() if p.state == ProcessState.RUNNING])
-        sleeping = len([p for p in self.processes.values() if p.state == ProcessState.BLOCKED])
+        # Count states in one pass over the table
+        running = sleeping = 0
+        for p in self.processes.values():
+            if p.state == _RUNNING:
+                running += 1
+            elif p.state == _BLOCKED:
+                sleeping += 1
         output += f"{running} running, {sleeping} sleeping\n"
         output += f"CPU(s): 100.0%us, 0.0%sy, 0.0%ni, 0.0%id, 0.0%wa\n"
-        output += f"Memory: 8GB total, {sum(p.memory_usage for p in self.processes.values())/1024:.1f}MB used\n\n"
+        output += f"Memory: 8GB total, {self._memory_used/1024:.1f}MB used\n\n"
         
         output += "PID\tUSER\t%CPU\t%MEM\tTIME+\tCOMMAND\n"
         
-        processes = sorted(self.processes.values(), 
-                         key=lambda p: random.uniform(0, 100) if p.state == ProcessState.RUNNING else 0, 
-                         reverse=True)
+        # Running processes first in random order, the rest keep table order
+        running_processes = [p for p in self.processes.values() if p.state == _RUNNING]
+        random.shuffle(running_processes)
+        processes = running_processes + [p for p in self.processes.values() if p.state != _RUNNING]
         
+        uniform = random.uniform
+        now = self.current_time
+        rows = []
         for process in processes[:15]:
-            cpu_percent = random.uniform(0, 25) if process.state == ProcessState.RUNNING else 0
+            cpu_percent = uniform(0, 25) if process.state == _RUNNING else 0
             mem_percent = (process.memory_usage / (8*1024*1024)) * 100
-            runtime = int(self.current_time - process.start_time)
-            output += f"{process.pid}\tuser\t{cpu_percent:.1f}\t{mem_percent:.1f}\t{runtime:02d}:{(runtime%3600)//60:02d}\t{process.command[:15]}\n"
+            runtime = int(now - process.start_time)
+            rows.append(f"{process.pid}\tuser\t{cpu_percent:.1f}\t{mem_percent:.1f}\t{runtime:02d}:{(runtime%3600)//60:02d}\t{process.command[:15]}\n")
+        output += "".join(rows)
         
-        return {"output": output, "processes": list(self.processes.values())}
+        return {"output": output, "processes": self._snapshot()}
 
     def _cmd_uptime(self, args: List[str]) -> Dict[str, Any]:
         uptime_seconds = int(self.current_time - self.processes[0].start_time)
@@ -531,11 +643,11 @@ AVAILABLE ALIASES:
         minutes, seconds = divmod(remainder, 60)
         load1, load5, load15 = random.uniform(0.1, 2.0), random.uniform(0.1, 2.0), random.uniform(0.1, 2.0)
         output = f" {time.strftime('%H:%M:%S')} up {hours:02d}:{minutes:02d}:{seconds:02d}, {len(self.processes)} processes, load average: {load1:.2f}, {load5:.2f}, {load15:.2f}\n"
-        return {"output": output, "processes": list(self.processes.values())}
+        return {"output": output, "processes": self._snapshot()}
     
     def _cmd_free(self, args: List[str]) -> Dict[str, Any]:
         total_mem = 8 * 1024 * 1024
-        used_mem = sum(p.memory_usage for p in self.processes.values())
+        used_mem = self._memory_used
         free_mem = total_mem - used_mem
         
         if '-h' in args:
@@ -544,71 +656,67 @@ AVAILABLE ALIASES:
         else:
             output = f"              total        used        free      shared  buff/cache   available\n"
             output += f"Mem:       {total_mem:8d}  {used_mem:8d}  {free_mem:8d}           0           0  {free_mem:8d}\n"
-        return {"output": output, "processes": list(self.processes.values())}
+        return {"output": output, "processes": self._snapshot()}
 
     def _cmd_whoami(self, args: List[str]) -> Dict[str, Any]:
-        return {"output": "user\nDummy user of LearnOS terminal\n", "processes": list(self.processes.values())}
+        return {"output": "user\nDummy user of LearnOS terminal\n", "processes": self._snapshot()}
 
     def _cmd_id(self, args: List[str]) -> Dict[str, Any]:
-        return {"output": "uid=1000(user) gid=1000(user)\n", "processes": list(self.processes.values())}
+        return {"output": "uid=1000(user) gid=1000(user)\n", "processes": self._snapshot()}
 
     def _cmd_uname(self, args: List[str]) -> Dict[str, Any]:
         if '-a' in args:
-            return {"output": "Linux learnos 5.15.0 #1 SMP x86_64 GNU/Linux\n", "processes": list(self.processes.values())}
-        return {"output": "Linux\n", "processes": list(self.processes.values())}
+            return {"output": "Linux learnos 5.15.0 #1 SMP x86_64 GNU/Linux\n", "processes": self._snapshot()}
+        return {"output": "Linux\n", "processes": self._snapshot()}
 
     def _cmd_env(self, args: List[str]) -> Dict[str, Any]:
-        output = "PATH=/usr/local/bin:/usr/bin:/bin\n"
-        output += "HOME=/home/user\n"
-        output += "USER=user\n"
-        output += "SHELL=/bin/bash\n"
-        output += "PWD=/home/user\n"
-        output += "TERM=xterm-256color\n"
-        return {"output": output, "processes": list(self.processes.values())}
+        return {"output": _ENV_OUTPUT, "processes": self._snapshot()}
 
     def _cmd_history(self, args: List[str]) -> Dict[str, Any]:
         if not self.command_history:
-            return {"output": "No command history\n", "processes": list(self.processes.values())}
+            return {"output": "No command history\n", "processes": self._snapshot()}
         
         output = ""
         start_idx = max(0, len(self.command_history) - 20)
-        for i, cmd in enumerate(self.command_history[start_idx:], start_idx + 1):
+        for i, cmd in enumerate(islice(self.command_history, start_idx, None), start_idx + 1):
             output += f"{i:4d}  {cmd}\n"
-        return {"output": output, "processes": list(self.processes.values())}
+        return {"output": output, "processes": self._snapshot()}
 
     def _cmd_alias(self, args: List[str]) -> Dict[str, Any]:
         if not args:
             output = ""
             for alias, command in self.aliases.items():
-                output += f"alias {alias}='{command}'\n"
-            return {"output": output, "processes": list(self.processes.values())}
-        return {"output": "Alias management\n", "processes": list(self.processes.values())}
+                output += f"alias {alias}='{' '.join(command)}'\n"
+            return {"output": output, "processes": self._snapshot()}
+        return {"output": "Alias management\n", "processes": self._snapshot()}
 
     def _cmd_pgrep(self, args: List[str]) -> Dict[str, Any]:
         if not args: 
-            return {"output": "Usage: pgrep <pattern>\n", "processes": list(self.processes.values())}
+            return {"output": "Usage: pgrep <pattern>\n", "processes": self._snapshot()}
         
         pattern = args[0].lower()
-        matches = []
-        for p in self.processes.values():
-            if pattern in p.name.lower() or pattern in p.command.lower():
-                matches.append(str(p.pid))
+        matches = [
+            str(pid) for pid, (name, command) in self._search_keys.items()
+            if pattern in name or pattern in command
+        ]
         
         output = "\n".join(matches) + "\n" if matches else f"pgrep: no process found matching '{pattern}'\n"
-        return {"output": output, "processes": list(self.processes.values())}
+        return {"output": output, "processes": self._snapshot()}
 
     def _cmd_pkill(self, args: List[str]) -> Dict[str, Any]:
         if not args:
-            return {"output": "Usage: pkill <pattern>\n", "processes": list(self.processes.values())}
+            return {"output": "Usage: pkill <pattern>\n", "processes": self._snapshot()}
         
         pattern = args[0].lower()
         killed_count = 0
         killed_processes = []
         
-        for p in self.processes.values():
-            if p.pid not in [0, 1] and (pattern in p.name.lower() or pattern in p.command.lower()):
-                p.state = ProcessState.TERMINATED
+        for pid, (name, command) in self._search_keys.items():
+            if pid not in [0, 1] and (pattern in name or pattern in command):
+                p = self.processes[pid]
+                p.state = _TERMINATED
                 p.exit_code = 15
+                self._generation += 1
                 killed_count += 1
                 killed_processes.append(f"{p.pid} ({p.name})")
         
@@ -619,20 +727,22 @@ AVAILABLE ALIASES:
             for proc in killed_processes:
                 output += f"  {proc}\n"
         
-        return {"output": output, "processes": list(self.processes.values())}
+        return {"output": output, "processes": self._snapshot()}
 
     def _cmd_killall(self, args: List[str]) -> Dict[str, Any]:
         if not args:
-            return {"output": "Usage: killall <name>\n", "processes": list(self.processes.values())}
+            return {"output": "Usage: killall <name>\n", "processes": self._snapshot()}
         
         name = args[0]
         killed_count = 0
         killed_processes = []
         
-        for p in self.processes.values():
-            if p.pid not in [0, 1] and p.name == name:
-                p.state = ProcessState.TERMINATED
+        for pid in self._pids_by_name.get(name, ()):
+            if pid not in [0, 1]:
+                p = self.processes[pid]
+                p.state = _TERMINATED
                 p.exit_code = 15
+                self._generation += 1
                 killed_count += 1
                 killed_processes.append(str(p.pid))
         
@@ -641,6 +751,6 @@ AVAILABLE ALIASES:
         else:
             output = f"killall: killed {killed_count} process(es) named '{name}': {', '.join(killed_processes)}\n"
         
-        return {"output": output, "processes": list(self.processes.values())}
+        return {"output": output, "processes": self._snapshot()}
 
 process_manager = ProcessManager()
\ No newline at end of file
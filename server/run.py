@@ -5,6 +5,8 @@ def main():
     """Main function to run the FastAPI server"""
     host = os.getenv("HOST", "0.0.0.0")
     port = int(os.getenv("PORT", 5000))
+    # The reloader watches files from a second process, so only run it in development
+    reload = os.getenv("APP_ENV", "prod") == "dev"
     
     print(f"Starting LearnOS Simulator server on {host}:{port}")
     
@@ -12,7 +14,7 @@ def main():
         "app.main:app",
         host=host,
         port=port,
-        reload=True,
+        reload=reload,
         log_level="info",
         access_log=True
     )